@@ -8,10 +8,25 @@ dynamics, articulation, and polyphony, using rational number timing.
 __version__ = "0.1.0"
 __author__ = "Clef Contributors"
 
-from clef.parser.parser import parse
-from clef.semantic.analyzer import analyze
-from clef.engine.compiler import compile_score
-from clef.backends.fluidsynth_backend import FluidSynthBackend
+# The public API is imported on first access, so that importing the package
+# for its version (as the CLI does) does not build the parser or load the
+# backends.
+_LAZY_IMPORTS = {
+    "parse": "clef.parser.parser",
+    "analyze": "clef.semantic.analyzer",
+    "compile_score": "clef.engine.compiler",
+    "FluidSynthBackend": "clef.backends.fluidsynth_backend",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "parse",
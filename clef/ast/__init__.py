@@ -10,6 +10,7 @@ __all__ = [
     "Score",
     "Staff",
     "Voice",
+    "VoiceBlock",
     "Measure",
     # Time and tempo
     "TimeSignature",
@@ -10,10 +10,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from fractions import Fraction
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import ClassVar, Dict, Mapping, Optional, Tuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Location:
     """Source location for error reporting."""
     line: int
@@ -27,7 +28,7 @@ class Location:
         return f"line {self.line}, column {self.column}"
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Node:
     """Base class for all AST nodes."""
     location: Optional[Location] = field(default=None, compare=False)
@@ -47,31 +48,39 @@ class Accidental(Enum):
     
     @classmethod
     def from_str(cls, s: str) -> "Accidental":
-        mapping = {
-            "n": cls.NATURAL,
-            "#": cls.SHARP,
-            "##": cls.DOUBLE_SHARP,
-            "b": cls.FLAT,
-            "bb": cls.DOUBLE_FLAT,
-        }
-        return mapping.get(s, cls.NATURAL)
+        return _ACCIDENTAL_FROM_STR.get(s, cls.NATURAL)
     
     def semitone_offset(self) -> int:
         """Return the semitone offset for this accidental."""
-        return {
-            Accidental.DOUBLE_FLAT: -2,
-            Accidental.FLAT: -1,
-            Accidental.NATURAL: 0,
-            Accidental.SHARP: 1,
-            Accidental.DOUBLE_SHARP: 2,
-        }[self]
+        return _ACCIDENTAL_SEMITONES[self.value]
+
+
+_ACCIDENTAL_FROM_STR: Dict[str, Accidental] = {
+    "n": Accidental.NATURAL,
+    "#": Accidental.SHARP,
+    "##": Accidental.DOUBLE_SHARP,
+    "b": Accidental.FLAT,
+    "bb": Accidental.DOUBLE_FLAT,
+}
+
+# Semitone offsets indexed by Accidental.value (auto() starts at 1)
+_ACCIDENTAL_SEMITONES: Tuple[int, ...] = (0, 0, 1, 2, -1, -2)
+
+# Source spellings indexed by Accidental.value
+_ACCIDENTAL_STR: Tuple[str, ...] = ("", "n", "#", "##", "b", "bb")
+
+# Semitones above C of each note name, in either case
+_BASE_SEMITONES: Dict[str, int] = {
+    "C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11,
+    "c": 0, "d": 2, "e": 4, "f": 5, "g": 7, "a": 9, "b": 11,
+}
 
 
 # ============================================================
 # Pitch
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Pitch(Node):
     """
     Represents a musical pitch.
@@ -84,40 +93,65 @@ class Pitch(Node):
     name: str  # C, D, E, F, G, A, B
     octave: int
     accidental: Optional[Accidental] = None
+    _midi: int = field(init=False, repr=False, compare=False)
     
-    def midi_number(self) -> int:
-        """Convert pitch to MIDI note number."""
+    def __post_init__(self) -> None:
         # C4 = 60 (middle C)
-        base_notes = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
-        note = base_notes[self.name.upper()]
+        note = _BASE_SEMITONES.get(self.name)
+        if note is None:
+            raise ValueError(f"Unknown pitch name: {self.name!r}")
         midi = (self.octave + 1) * 12 + note
         if self.accidental:
             midi += self.accidental.semitone_offset()
-        return midi
+        object.__setattr__(self, "_midi", midi)
+    
+    @classmethod
+    def get(cls, name: str, octave: int,
+            accidental: Optional[Accidental] = None) -> "Pitch":
+        """Return a shared Pitch instance for the given spelling."""
+        key = (name, octave, accidental)
+        pitch = _PITCH_POOL.get(key)
+        if pitch is None:
+            pitch = _PITCH_POOL[key] = cls(name=name, octave=octave, accidental=accidental)
+        return pitch
+    
+    def midi_number(self) -> int:
+        """Convert pitch to MIDI note number."""
+        return self._midi
     
     def __str__(self) -> str:
-        acc_str = ""
-        if self.accidental:
-            acc_map = {
-                Accidental.SHARP: "#",
-                Accidental.DOUBLE_SHARP: "##",
-                Accidental.FLAT: "b",
-                Accidental.DOUBLE_FLAT: "bb",
-                Accidental.NATURAL: "n",
-            }
-            acc_str = acc_map.get(self.accidental, "")
+        acc_str = _ACCIDENTAL_STR[self.accidental.value] if self.accidental else ""
         return f"{self.name}{acc_str}{self.octave}"
     
     def enharmonic_equal(self, other: "Pitch") -> bool:
         """Check if two pitches are enharmonically equivalent."""
-        return self.midi_number() == other.midi_number()
+        return self._midi == other._midi
+    
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self._midi == other._midi
+            and self.accidental is other.accidental
+            and self.name == other.name
+        )
+    
+    def __hash__(self) -> int:
+        # MIDI number above the accidental's bits, unique per spelling
+        return (self._midi << 4) | (self.accidental.value if self.accidental else 0)
+
+
+# Interned pitches, keyed by (name, octave, accidental)
+_PITCH_POOL: Dict[Tuple[str, int, Optional[Accidental]], Pitch] = {}
 
 
 # ============================================================
 # Duration
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Duration(Node):
     """
     Represents a note or rest duration using rational arithmetic.
@@ -128,22 +162,33 @@ class Duration(Node):
     """
     base_value: Fraction  # As fraction of a whole note (1 = whole, 1/4 = quarter, etc.)
     dots: int = 0
+    _value: Fraction = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # n dots give base * (2^(n+1) - 1) / 2^n
+        object.__setattr__(self, "_value", Fraction(
+            self.base_value.numerator * ((1 << (self.dots + 1)) - 1),
+            self.base_value.denominator << self.dots,
+        ))
     
     @classmethod
     def from_name(cls, name: str, dots: int = 0, location: Optional[Location] = None) -> "Duration":
         """Create a duration from a standard name."""
-        mapping = {
-            "w": Fraction(1, 1),      # whole
-            "h": Fraction(1, 2),      # half
-            "q": Fraction(1, 4),      # quarter
-            "e": Fraction(1, 8),      # eighth
-            "s": Fraction(1, 16),     # sixteenth
-            "t": Fraction(1, 32),     # thirty-second
-            "x": Fraction(1, 64),     # sixty-fourth
-        }
-        if name not in mapping:
+        base_value = _DURATION_VALUES.get(name)
+        if base_value is None:
             raise ValueError(f"Unknown duration name: {name}")
-        return cls(base_value=mapping[name], dots=dots, location=location)
+        if location is None:
+            return cls.get(base_value, dots)
+        return cls(base_value=base_value, dots=dots, location=location)
+    
+    @classmethod
+    def get(cls, base_value: Fraction, dots: int = 0) -> "Duration":
+        """Return a shared Duration instance for the given value."""
+        key = (base_value.numerator, base_value.denominator, dots)
+        duration = _DURATION_POOL.get(key)
+        if duration is None:
+            duration = _DURATION_POOL[key] = cls(base_value=base_value, dots=dots)
+        return duration
     
     @classmethod
     def from_fraction(cls, numerator: int, denominator: int, 
@@ -153,27 +198,46 @@ class Duration(Node):
     
     def total_value(self) -> Fraction:
         """Calculate the total duration including dots."""
-        value = self.base_value
-        dot_value = value
-        for _ in range(self.dots):
-            dot_value = dot_value / 2
-            value = value + dot_value
-        return value
+        return self._value
+    
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.dots == other.dots and self.base_value == other.base_value
+    
+    def __hash__(self) -> int:
+        # Same key as the intern pool; hashing the Fraction itself is slower
+        base_value = self.base_value
+        return hash((base_value.numerator, base_value.denominator, self.dots))
     
     def __str__(self) -> str:
-        name_map = {
-            Fraction(1, 1): "w",
-            Fraction(1, 2): "h",
-            Fraction(1, 4): "q",
-            Fraction(1, 8): "e",
-            Fraction(1, 16): "s",
-            Fraction(1, 32): "t",
-            Fraction(1, 64): "x",
-        }
-        name = name_map.get(self.base_value, f"{self.base_value.numerator}/{self.base_value.denominator}")
+        name = _DURATION_NAMES.get(self.base_value, f"{self.base_value.numerator}/{self.base_value.denominator}")
         return name + ("." * self.dots)
 
 
+_DURATION_VALUES: Dict[str, Fraction] = {
+    "w": Fraction(1, 1),      # whole
+    "h": Fraction(1, 2),      # half
+    "q": Fraction(1, 4),      # quarter
+    "e": Fraction(1, 8),      # eighth
+    "s": Fraction(1, 16),     # sixteenth
+    "t": Fraction(1, 32),     # thirty-second
+    "x": Fraction(1, 64),     # sixty-fourth
+}
+
+_DURATION_NAMES: Dict[Fraction, str] = {
+    value: name for name, value in _DURATION_VALUES.items()
+}
+
+# Interned durations, keyed by (numerator, denominator, dots)
+_DURATION_POOL: Dict[Tuple[int, int, int], Duration] = {}
+
+# Shared default beat unit for tempo marks
+_QUARTER = Duration.get(_DURATION_VALUES["q"])
+
+
 # ============================================================
 # Articulations
 # ============================================================
@@ -190,19 +254,21 @@ class ArticulationType(Enum):
     
     @classmethod
     def from_str(cls, s: str) -> "ArticulationType":
-        mapping = {
-            "staccato": cls.STACCATO,
-            "staccatissimo": cls.STACCATISSIMO,
-            "legato": cls.LEGATO,
-            "accent": cls.ACCENT,
-            "tenuto": cls.TENUTO,
-            "marcato": cls.MARCATO,
-            "fermata": cls.FERMATA,
-        }
-        return mapping[s.lower()]
-
-
-@dataclass(frozen=True)
+        return _ARTICULATION_FROM_STR[s.lower()]
+
+
+_ARTICULATION_FROM_STR: Dict[str, ArticulationType] = {
+    "staccato": ArticulationType.STACCATO,
+    "staccatissimo": ArticulationType.STACCATISSIMO,
+    "legato": ArticulationType.LEGATO,
+    "accent": ArticulationType.ACCENT,
+    "tenuto": ArticulationType.TENUTO,
+    "marcato": ArticulationType.MARCATO,
+    "fermata": ArticulationType.FERMATA,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Articulation(Node):
     """Represents an articulation marking."""
     type: ArticulationType
@@ -222,23 +288,25 @@ class OrnamentType(Enum):
     
     @classmethod
     def from_str(cls, s: str) -> "OrnamentType":
-        mapping = {
-            "mordent": cls.MORDENT,
-            "turn": cls.TURN,
-            "inverted_turn": cls.INVERTED_TURN,
-            "shake": cls.SHAKE,
-            "trill": cls.TRILL,
-        }
-        return mapping[s.lower()]
+        return _ORNAMENT_FROM_STR[s.lower()]
 
 
-@dataclass(frozen=True)
+_ORNAMENT_FROM_STR: Dict[str, OrnamentType] = {
+    "mordent": OrnamentType.MORDENT,
+    "turn": OrnamentType.TURN,
+    "inverted_turn": OrnamentType.INVERTED_TURN,
+    "shake": OrnamentType.SHAKE,
+    "trill": OrnamentType.TRILL,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Ornament(Node):
     """Represents an ornament marking."""
     type: OrnamentType
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Trill(Ornament):
     """Represents a trill, optionally with auxiliary note."""
     type: OrnamentType = field(default=OrnamentType.TRILL)
@@ -249,14 +317,14 @@ class Trill(Ornament):
 # Notes, Rests, and Chords
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraceNote(Node):
     """Represents a grace note (appoggiatura or acciaccatura)."""
     pitch: Pitch
     slashed: bool = False  # True for acciaccatura
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Note(Node):
     """
     Represents a single note.
@@ -277,13 +345,13 @@ class Note(Node):
     grace_notes: Tuple[GraceNote, ...] = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rest(Node):
     """Represents a rest."""
     duration: Duration
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Chord(Node):
     """
     Represents a chord (multiple simultaneous pitches).
@@ -302,13 +370,13 @@ class Chord(Node):
 # Ties and Slurs
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tie(Node):
     """Marker for a tie connecting to the next note."""
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Slur(Node):
     """
     Represents a slur grouping notes together.
@@ -322,7 +390,7 @@ class Slur(Node):
 # Tuplets
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tuplet(Node):
     """
     Represents a tuplet (e.g., triplet, quintuplet).
@@ -338,17 +406,23 @@ class Tuplet(Node):
     actual: int
     normal: int
     contents: Tuple[Node, ...]
+    _ratio: Fraction = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # A zero count is left for the semantic analyzer to report
+        ratio = Fraction(self.normal, self.actual) if self.actual else Fraction(0)
+        object.__setattr__(self, "_ratio", ratio)
     
     def ratio(self) -> Fraction:
         """Return the tuplet ratio for duration modification."""
-        return Fraction(self.normal, self.actual)
+        return self._ratio
 
 
 # ============================================================
 # Dynamics
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dynamic(Node):
     """
     Represents a dynamic marking.
@@ -368,22 +442,24 @@ class Dynamic(Node):
     """
     marking: str  # ppp, pp, p, mp, mf, f, ff, fff, fp, sfz, sf
     
+    # Read-only marking -> velocity table, also the set of valid markings
+    VELOCITIES: ClassVar[Mapping[str, int]] = MappingProxyType({
+        "ppp": 16,
+        "pp": 33,
+        "p": 49,
+        "mp": 64,
+        "mf": 80,
+        "f": 96,
+        "ff": 112,
+        "fff": 127,
+        "fp": 96,   # Initial forte
+        "sfz": 127,
+        "sf": 112,
+    })
+    
     def velocity(self) -> int:
         """Convert dynamic marking to MIDI velocity (0-127)."""
-        mapping = {
-            "ppp": 16,
-            "pp": 33,
-            "p": 49,
-            "mp": 64,
-            "mf": 80,
-            "f": 96,
-            "ff": 112,
-            "fff": 127,
-            "fp": 96,   # Initial forte
-            "sfz": 127,
-            "sf": 112,
-        }
-        return mapping.get(self.marking, 80)
+        return self.VELOCITIES.get(self.marking, 80)
 
 
 class HairpinType(Enum):
@@ -394,15 +470,17 @@ class HairpinType(Enum):
     
     @classmethod
     def from_str(cls, s: str) -> "HairpinType":
-        mapping = {
-            "cresc": cls.CRESCENDO,
-            "decresc": cls.DECRESCENDO,
-            "dim": cls.DIMINUENDO,
-        }
-        return mapping[s.lower()]
+        return _HAIRPIN_FROM_STR[s.lower()]
+
 
+_HAIRPIN_FROM_STR: Dict[str, HairpinType] = {
+    "cresc": HairpinType.CRESCENDO,
+    "decresc": HairpinType.DECRESCENDO,
+    "dim": HairpinType.DIMINUENDO,
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Hairpin(Node):
     """
     Represents a crescendo or decrescendo hairpin.
@@ -427,15 +505,17 @@ class PedalType(Enum):
     
     @classmethod
     def from_str(cls, s: str) -> "PedalType":
-        mapping = {
-            "ped": cls.DOWN,
-            "ped_up": cls.UP,
-            "ped_change": cls.CHANGE,
-        }
-        return mapping[s.lower()]
+        return _PEDAL_FROM_STR[s.lower()]
+
 
+_PEDAL_FROM_STR: Dict[str, PedalType] = {
+    "ped": PedalType.DOWN,
+    "ped_up": PedalType.UP,
+    "ped_change": PedalType.CHANGE,
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Pedal(Node):
     """Represents a sustain pedal marking."""
     type: PedalType
@@ -445,7 +525,7 @@ class Pedal(Node):
 # Time and Tempo
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TimeSignature(Node):
     """
     Represents a time signature.
@@ -456,16 +536,20 @@ class TimeSignature(Node):
     """
     numerator: int
     denominator: int
+    _beats: Fraction = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_beats", Fraction(self.numerator, self.denominator))
     
     def beats_per_measure(self) -> Fraction:
         """Return the total duration of one measure in whole notes."""
-        return Fraction(self.numerator, self.denominator)
+        return self._beats
     
     def __str__(self) -> str:
         return f"{self.numerator}/{self.denominator}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TempoMark(Node):
     """
     Represents a tempo marking in BPM.
@@ -475,13 +559,13 @@ class TempoMark(Node):
         beat_unit: The note value that represents one beat (default: quarter)
     """
     bpm: int
-    beat_unit: Duration = field(default_factory=lambda: Duration.from_name("q"))
+    beat_unit: Duration = _QUARTER
     
     def __str__(self) -> str:
         return f"♩ = {self.bpm}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class KeySignature(Node):
     """
     Represents a key signature.
@@ -496,21 +580,22 @@ class KeySignature(Node):
     accidental: Optional[Accidental] = None
     
     def __str__(self) -> str:
-        acc_str = ""
-        if self.accidental:
-            acc_map = {
-                Accidental.SHARP: "#",
-                Accidental.FLAT: "b",
-            }
-            acc_str = acc_map.get(self.accidental, "")
+        acc_str = _KEY_ACCIDENTAL_STR.get(self.accidental, "")
         return f"{self.root}{acc_str} {self.mode}"
 
 
+# Key roots only print single sharps and flats
+_KEY_ACCIDENTAL_STR: Dict[Optional[Accidental], str] = {
+    Accidental.SHARP: "#",
+    Accidental.FLAT: "b",
+}
+
+
 # ============================================================
 # Instrument
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InstrumentChange(Node):
     """Represents an instrument change within a staff."""
     instrument: str
@@ -520,7 +605,7 @@ class InstrumentChange(Node):
 # Measures, Voices, Staves, Score
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Measure(Node):
     """
     Represents a measure (bar) of music.
@@ -533,7 +618,23 @@ class Measure(Node):
     number: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class VoiceBlock(Node):
+    """
+    Represents a ``voice N { ... }`` group inside a measure.
+    
+    The voice blocks of a measure all start at the beginning of the
+    measure; blocks with the same number continue one another.
+    
+    Attributes:
+        number: Voice number
+        contents: Notes, rests, chords, etc. in this block
+    """
+    number: int
+    contents: Tuple[Node, ...]
+
+
+@dataclass(frozen=True, slots=True)
 class Voice(Node):
     """
     Represents a voice within a staff.
@@ -543,12 +644,19 @@ class Voice(Node):
     Attributes:
         number: Voice number (1, 2, etc.)
         contents: Measures and other content in this voice
+        measures: The measures in ``contents``, in source order
     """
     number: int
     contents: Tuple[Node, ...]
+    measures: Tuple[Measure, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "measures", tuple(i for i in self.contents if isinstance(i, Measure))
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Staff(Node):
     """
     Represents a staff in the score.
@@ -557,13 +665,22 @@ class Staff(Node):
         name: Identifier for the staff (e.g., 'piano', 'violin')
         instrument: The instrument for this staff
         contents: Voices, measures, and other content
+        voices: The voices in ``contents``, in source order
+        measures: The measures placed directly in ``contents``
     """
     name: str
     contents: Tuple[Node, ...]
     instrument: Optional[str] = None
+    voices: Tuple[Voice, ...] = field(init=False, repr=False, compare=False)
+    measures: Tuple[Measure, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        contents = self.contents
+        object.__setattr__(self, "voices", tuple(i for i in contents if isinstance(i, Voice)))
+        object.__setattr__(self, "measures", tuple(i for i in contents if isinstance(i, Measure)))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Score(Node):
     """
     Root node representing an entire musical score.
@@ -67,6 +67,16 @@ class Backend(ABC):
         """
         pass
     
+    def prepare(self) -> None:
+        """
+        Get ready to play ahead of the first call to play().
+        
+        Backends with slow setup (such as loading a SoundFont) do it here,
+        so callers can overlap it with other work. play() still works
+        without it. The default does nothing.
+        """
+        pass
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
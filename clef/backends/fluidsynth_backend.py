@@ -7,12 +7,14 @@ sustain pedal, and accurate timing.
 """
 
 from __future__ import annotations
+import heapq
 import os
 import time
 import threading
 from fractions import Fraction
+from itertools import count
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Any
 
 from clef.backends.base import Backend, BackendError
 from clef.engine.events import (
@@ -27,6 +29,34 @@ from clef.engine.events import (
 )
 
 
+# Common SoundFont locations, searched after the user-specified path and
+# the CLEF_SOUNDFONT environment variable
+SOUNDFONT_SEARCH_PATHS = (
+    # Linux
+    "/usr/share/sounds/sf2/FluidR3_GM.sf2",
+    "/usr/share/soundfonts/FluidR3_GM.sf2",
+    "/usr/share/sounds/sf2/default.sf2",
+    "/usr/share/soundfonts/default.sf2",
+    "/usr/share/sounds/sf2/TimGM6mb.sf2",
+    # macOS (Homebrew)
+    "/usr/local/share/fluidsynth/FluidR3_GM.sf2",
+    "/opt/homebrew/share/fluidsynth/FluidR3_GM.sf2",
+    # Windows
+    "C:/soundfonts/FluidR3_GM.sf2",
+    "C:/Program Files/FluidSynth/share/soundfonts/FluidR3_GM.sf2",
+    # Home directory
+    Path.home() / ".local/share/soundfonts/FluidR3_GM.sf2",
+    Path.home() / "soundfonts/FluidR3_GM.sf2",
+)
+
+# Sequencer resolution (ticks per second)
+SEQUENCER_TIME_SCALE = 1000
+
+# Head start given to the sequencer before the first scheduled event, in
+# seconds, so that scheduling the score does not delay its opening notes
+SCHEDULE_LATENCY = 0.1
+
+
 class FluidSynthBackend(Backend):
     """
     FluidSynth-based playback backend.
@@ -52,15 +82,14 @@ class FluidSynthBackend(Backend):
                           to find a default system SoundFont.
         """
         self._synth = None
+        self._sequencer = None
+        self._synth_dest: Optional[int] = None
         self._soundfont_path = soundfont_path
+        self._found_soundfont: Optional[str] = None
         self._soundfont_id: Optional[int] = None
         self._playing = False
         self._play_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._current_tempo: int = 120
-        
-        # Track active notes for proper note-off
-        self._active_notes: Dict[int, List[int]] = {}  # channel -> [notes]
     
     @property
     def name(self) -> str:
@@ -79,32 +108,20 @@ class FluidSynthBackend(Backend):
     
     def _find_soundfont(self) -> Optional[str]:
         """Find a SoundFont on the system."""
-        # Common SoundFont locations
-        search_paths = [
+        if self._found_soundfont is not None:
+            return self._found_soundfont
+        
+        search_paths = (
             # User-specified
             self._soundfont_path,
             # Environment variable
             os.environ.get("CLEF_SOUNDFONT"),
-            # Linux
-            "/usr/share/sounds/sf2/FluidR3_GM.sf2",
-            "/usr/share/soundfonts/FluidR3_GM.sf2",
-            "/usr/share/sounds/sf2/default.sf2",
-            "/usr/share/soundfonts/default.sf2",
-            "/usr/share/sounds/sf2/TimGM6mb.sf2",
-            # macOS (Homebrew)
-            "/usr/local/share/fluidsynth/FluidR3_GM.sf2",
-            "/opt/homebrew/share/fluidsynth/FluidR3_GM.sf2",
-            # Windows
-            "C:/soundfonts/FluidR3_GM.sf2",
-            "C:/Program Files/FluidSynth/share/soundfonts/FluidR3_GM.sf2",
-            # Home directory
-            Path.home() / ".local/share/soundfonts/FluidR3_GM.sf2",
-            Path.home() / "soundfonts/FluidR3_GM.sf2",
-        ]
+        ) + SOUNDFONT_SEARCH_PATHS
         
         for path in search_paths:
             if path and Path(path).exists():
-                return str(path)
+                self._found_soundfont = str(path)
+                return self._found_soundfont
         
         return None
     
@@ -143,15 +160,37 @@ class FluidSynthBackend(Backend):
         # Select default program for all channels
         for channel in range(16):
             self._synth.program_select(channel, self._soundfont_id, 0, 0)
-            self._active_notes[channel] = []
+    
+    def prepare(self) -> None:
+        """Start the synthesizer and load the SoundFont ahead of playback."""
+        self._initialize()
+    
+    def _open_sequencer(self) -> None:
+        """Create the sequencer that delivers note events to the synth."""
+        if self._sequencer is not None:
+            return
+        
+        import fluidsynth
+        
+        self._sequencer = fluidsynth.Sequencer(time_scale=SEQUENCER_TIME_SCALE)
+        self._synth_dest = self._sequencer.register_fluidsynth(self._synth)
+    
+    def _cancel_scheduled(self) -> None:
+        """Drop any events still queued in the sequencer and silence the synth."""
+        if self._sequencer is not None:
+            self._sequencer.delete()
+            self._sequencer = None
+            self._synth_dest = None
+        
+        if self._synth is not None:
+            for channel in range(16):
+                self._synth.all_notes_off(channel)
     
     def _shutdown(self) -> None:
         """Shutdown the synthesizer."""
         if self._synth is not None:
             # Stop all notes
-            for channel, notes in self._active_notes.items():
-                for note in notes:
-                    self._synth.noteoff(channel, note)
+            self._cancel_scheduled()
             
             self._synth.delete()
             self._synth = None
@@ -165,6 +204,7 @@ class FluidSynthBackend(Backend):
             blocking: If True, wait for playback to complete
         """
         self._initialize()
+        self._open_sequencer()
         self._stop_event.clear()
         
         if blocking:
@@ -180,166 +220,162 @@ class FluidSynthBackend(Backend):
     def _play_events(self, graph: EventGraph) -> None:
         """Play events in real-time."""
         self._playing = True
-        self._current_tempo = graph.initial_tempo
         
         # Sort and prepare events
         graph.sort()
         
-        # Convert events to absolute time in seconds
-        timed_events = self._convert_to_seconds(graph)
-        
-        if not timed_events:
-            self._playing = False
-            return
-        
-        # Play events
-        start_real_time = time.perf_counter()
-        
-        for event_time, event in timed_events:
+        # Events are converted to absolute seconds as they are consumed.
+        # Notes go to the FluidSynth sequencer ahead of time, stamped with
+        # their absolute tick, so note timing follows the synth's own clock.
+        # Control events are applied from this thread when their time comes,
+        # which also paces how far ahead the notes after them are scheduled.
+        sequencer = self._sequencer
+        dest = self._synth_dest
+        start_tick = sequencer.get_tick() + int(SCHEDULE_LATENCY * SEQUENCER_TIME_SCALE)
+        start_real_time = time.perf_counter() + SCHEDULE_LATENCY
+        
+        end_time = None
+        for event_time, event_data in self._convert_to_seconds(graph):
             if self._stop_event.is_set():
                 break
+            event_type, event = event_data
+            end_time = event_time
             
-            # Wait until event time
-            current_time = time.perf_counter() - start_real_time
-            wait_time = float(event_time) - current_time
-            if wait_time > 0:
-                # Use small sleep intervals to allow stopping
-                while wait_time > 0 and not self._stop_event.is_set():
-                    time.sleep(min(wait_time, 0.01))
-                    current_time = time.perf_counter() - start_real_time
-                    wait_time = float(event_time) - current_time
-            
-            if self._stop_event.is_set():
-                break
-            
-            # Process event
-            self._process_event(event)
+            if event_type == "note_on":
+                sequencer.note_on(
+                    start_tick + round(event_time * SEQUENCER_TIME_SCALE),
+                    event.channel, event.midi_note, event.velocity, dest=dest,
+                )
+            elif event_type == "note_off":
+                sequencer.note_off(
+                    start_tick + round(event_time * SEQUENCER_TIME_SCALE),
+                    event.channel, event.midi_note, dest=dest,
+                )
+            else:
+                # Only events the synth acts on need to wait for their time
+                handler = self._EVENT_HANDLERS.get(type(event))
+                if handler is None:
+                    continue
+                wait_time = start_real_time + event_time - time.perf_counter()
+                if wait_time > 0 and self._stop_event.wait(wait_time):
+                    break
+                if self._stop_event.is_set():
+                    break
+                handler(self, event)
+        
+        # Wait for the scheduled notes to finish
+        if end_time is not None and not self._stop_event.is_set():
+            remaining = start_real_time + end_time + 0.5 - time.perf_counter()
+            if remaining > 0:
+                self._stop_event.wait(remaining)
         
-        # Wait for final notes to finish
-        if not self._stop_event.is_set():
-            time.sleep(0.5)
+        if self._stop_event.is_set():
+            self._cancel_scheduled()
         
         self._playing = False
     
-    def _convert_to_seconds(self, graph: EventGraph) -> List[tuple]:
-        """Convert event times from whole notes to seconds."""
-        events_with_time = []
-        tempo = graph.initial_tempo
-        last_tempo_time = Fraction(0)
-        last_real_time = Fraction(0)
-        
-        # First, collect tempo changes
-        tempo_changes = []
-        for event in graph.events:
-            if isinstance(event, TempoEvent):
-                tempo_changes.append((event.start_time, event.bpm))
-        tempo_changes.sort()
-        
-        def get_tempo_at(time: Fraction) -> int:
-            """Get the tempo at a given time."""
-            current_tempo = graph.initial_tempo
-            for t, bpm in tempo_changes:
-                if t <= time:
-                    current_tempo = bpm
-                else:
-                    break
-            return current_tempo
+    def _convert_to_seconds(self, graph: EventGraph) -> Iterator[tuple]:
+        """
+        Convert event times from whole notes to seconds.
         
-        def time_to_seconds(t: Fraction) -> Fraction:
-            """Convert time in whole notes to seconds."""
-            result = Fraction(0)
-            prev_time = Fraction(0)
-            prev_tempo = graph.initial_tempo
-            
-            for change_time, new_tempo in tempo_changes:
-                if change_time >= t:
-                    break
-                # Add time before this tempo change
-                duration = change_time - prev_time
-                seconds_per_whole = Fraction(240, prev_tempo)  # 4 beats per whole, 60/bpm per beat
-                result += duration * seconds_per_whole
-                prev_time = change_time
-                prev_tempo = new_tempo
-            
-            # Add remaining time
-            duration = t - prev_time
-            seconds_per_whole = Fraction(240, prev_tempo)
-            result += duration * seconds_per_whole
-            
-            return result
+        Yields ``(seconds, (kind, event))`` pairs in time order, where kind is
+        "note_on", "note_off" or "other". The graph must already be sorted.
+        Playback timing is float seconds throughout; event times leave exact
+        Fraction arithmetic once, here, as each event is yielded.
+        """
+        # Everything happens in one pass over the sorted graph. The tempo map
+        # is followed as a running segment: the whole-note time it starts
+        # at, the seconds elapsed by then and the seconds per whole note
+        # from there on (4 beats per whole, 60/bpm per beat). Tempo changes
+        # sort ahead of other events at the same time.
+        segment_time = Fraction(0)
+        segment_seconds = 0.0
+        segment_rate = 240.0 / graph.initial_tempo
+        
+        # Note-ons and other events come out of the graph in time order;
+        # only note-offs need ordering. They wait in a heap keyed by their
+        # exact whole-note end time and are converted to seconds when
+        # released, just before the first event that starts after them, by
+        # which point every tempo change up to their end has been seen.
+        # Keeping the keys exact means a note-off always comes out before a
+        # note-on at the same time, however the float seconds round.
+        pending_offs: List[tuple] = []  # (end time, sequence, event data)
+        sequence = count()
         
         # Process all events
         for event in graph.events:
-            event_time_seconds = time_to_seconds(event.start_time)
+            start_time = event.start_time
+            
+            while pending_offs and pending_offs[0][0] <= start_time:
+                end_time, _, off = heapq.heappop(pending_offs)
+                yield segment_seconds + float(end_time - segment_time) * segment_rate, off
+            
+            event_time_seconds = segment_seconds + float(start_time - segment_time) * segment_rate
             
             if isinstance(event, NoteEvent):
                 # Add note on
-                events_with_time.append((event_time_seconds, ("note_on", event)))
+                yield event_time_seconds, ("note_on", event)
                 
-                # Add note off
-                end_time = event.start_time + event.effective_duration()
-                end_time_seconds = time_to_seconds(end_time)
-                events_with_time.append((end_time_seconds, ("note_off", event)))
+                # Queue note off
+                end_time = start_time + event.effective_duration()
+                heapq.heappush(
+                    pending_offs,
+                    (end_time, next(sequence), ("note_off", event)),
+                )
             else:
-                events_with_time.append((event_time_seconds, ("other", event)))
-        
-        # Sort by time
-        events_with_time.sort(key=lambda x: x[0])
-        
-        return events_with_time
+                if isinstance(event, TempoEvent):
+                    segment_time = start_time
+                    segment_seconds = event_time_seconds
+                    segment_rate = 240.0 / event.bpm
+                yield event_time_seconds, ("other", event)
+        
+        while pending_offs:
+            end_time, _, off = heapq.heappop(pending_offs)
+            yield segment_seconds + float(end_time - segment_time) * segment_rate, off
     
-    def _process_event(self, event_data: tuple) -> None:
-        """Process a single event."""
-        event_type, event = event_data
-        
-        if event_type == "note_on" and isinstance(event, NoteEvent):
-            self._synth.noteon(event.channel, event.midi_note, event.velocity)
-            self._active_notes[event.channel].append(event.midi_note)
-        
-        elif event_type == "note_off" and isinstance(event, NoteEvent):
-            self._synth.noteoff(event.channel, event.midi_note)
-            if event.midi_note in self._active_notes[event.channel]:
-                self._active_notes[event.channel].remove(event.midi_note)
-        
-        elif isinstance(event, ProgramChangeEvent):
-            self._synth.program_select(
-                event.channel, 
-                self._soundfont_id, 
-                0,  # bank
-                event.program
-            )
-        
-        elif isinstance(event, PedalEvent):
-            self._synth.cc(event.channel, 64, event.value)
-        
-        elif isinstance(event, ControlChangeEvent):
-            self._synth.cc(event.channel, event.controller, event.value)
-        
-        elif isinstance(event, TempoEvent):
-            self._current_tempo = event.bpm
+    def _handle_program_change(self, event: ProgramChangeEvent) -> None:
+        self._synth.program_select(
+            event.channel, 
+            self._soundfont_id, 
+            0,  # bank
+            event.program
+        )
+    
+    def _handle_pedal(self, event: PedalEvent) -> None:
+        # Pedal events carry no channel; use channel 0 like the MIDI export
+        self._synth.cc(0, 64, event.value)
+    
+    def _handle_control_change(self, event: ControlChangeEvent) -> None:
+        self._synth.cc(event.channel, event.controller, event.value)
+    
+    # Event type -> handler, looked up once per event
+    _EVENT_HANDLERS = {
+        ProgramChangeEvent: _handle_program_change,
+        PedalEvent: _handle_pedal,
+        ControlChangeEvent: _handle_control_change,
+    }
     
     def stop(self) -> None:
         """Stop playback immediately."""
         self._stop_event.set()
         
-        if self._synth is not None:
-            # Stop all notes immediately
-            for channel, notes in self._active_notes.items():
-                for note in list(notes):
-                    self._synth.noteoff(channel, note)
-                self._active_notes[channel] = []
-        
         if self._play_thread is not None:
-            self._play_thread.join(timeout=1.0)
+            # The thread stops at its next event. Wait for it, so the
+            # sequencer it is feeding is not deleted while still in use.
+            self._play_thread.join()
             self._play_thread = None
+        
+        # Stop all notes immediately, including ones not yet delivered
+        self._cancel_scheduled()
     
     def render(self, graph: EventGraph, output_path: Path,
                format: str = "wav") -> None:
         """
         Render an event graph to an audio file.
         
-        Note: This requires FluidSynth to be compiled with audio file support.
-        For a simpler approach, we can use MIDI export + external conversion.
+        The graph is exported to MIDI and rendered by the ``fluidsynth``
+        command-line tool; pyfluidsynth does not expose FluidSynth's file
+        renderer.
         """
         try:
             import fluidsynth
@@ -350,14 +386,6 @@ class FluidSynthBackend(Backend):
         if not soundfont:
             raise BackendError("No SoundFont found")
         
-        # Create offline synth for rendering
-        synth = fluidsynth.Synth()
-        
-        # FluidSynth settings for file rendering
-        # This is a simplified approach - full implementation would use
-        # FluidSynth's sequencer with file renderer
-        
-        # For now, we'll export to MIDI and recommend external conversion
         midi_path = output_path.with_suffix(".mid")
         self.export_midi(graph, midi_path)
         
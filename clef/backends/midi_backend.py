@@ -6,9 +6,11 @@ external sequencers, DAWs, or notation software.
 """
 
 from __future__ import annotations
+import io
 from fractions import Fraction
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from itertools import chain
+from typing import Optional, Dict, List, Set, Tuple
 
 from midiutil import MIDIFile
 
@@ -26,6 +28,16 @@ from clef.engine.events import (
 )
 
 
+# MIDI uses log2(denominator) for time signatures
+_DENOMINATOR_POWERS: Dict[int, int] = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4, 32: 5}
+
+# Event fields that place an event rather than describe its MIDI payload
+_EVENT_PLACEMENT_FIELDS = frozenset({"start_time", "staff_id", "voice_id"})
+
+# Events that apply to the whole score and always go on the global track
+_GLOBAL_EVENT_TYPES = (TempoEvent, TimeSignatureEvent)
+
+
 class MidiFileBackend(Backend):
     """
     MIDI file export backend.
@@ -77,36 +89,43 @@ class MidiFileBackend(Backend):
             graph: The event graph to export
             output_path: Path for the output MIDI file
         """
-        # Determine number of tracks (one per staff + one for tempo/time sig)
-        staff_ids = set()
-        for event in graph.events:
-            if event.staff_id != "__global__":
-                staff_ids.add(event.staff_id)
+        # Determine number of tracks (one per staff + one for tempo/time sig),
+        # in the order the score declares the staves; any staff the graph
+        # does not list follows, in the order its events first appear
+        declared = {staff_id: i for i, staff_id in enumerate(graph.staff_ids)}
+        staff_ids = sorted(
+            dict.fromkeys(
+                event.staff_id for event in graph.events
+                if event.staff_id != "__global__"
+            ),
+            key=lambda staff_id: declared.get(staff_id, len(declared)),
+        )
         
         num_tracks = len(staff_ids) + 1  # +1 for global track
         
         # Create MIDI file
         midi = MIDIFile(
             numTracks=num_tracks,
-            removeDuplicates=True,
+            removeDuplicates=False,  # events are de-duplicated below
             deinterleave=True,
             ticks_per_quarternote=self.PPQN,
+            eventtime_is_ticks=True,
         )
         
         # Track mapping
         track_map: Dict[str, int] = {"__global__": 0}
-        for i, staff_id in enumerate(sorted(staff_ids), start=1):
+        for i, staff_id in enumerate(staff_ids, start=1):
             track_map[staff_id] = i
         
-        # Set initial tempo (track 0 for global events)
-        initial_tempo = graph.initial_tempo
-        midi.addTempo(0, 0, initial_tempo)
-        
-        # Set initial time signature
+        # Initial tempo and time signature (track 0 for global events);
+        # these go through the same de-duplication as the graph's events
         num, denom = graph.initial_time_signature
-        # MIDI uses log2(denominator) for time signature
-        denom_power = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4, 32: 5}.get(denom, 2)
-        midi.addTimeSignature(0, 0, num, denom_power, 24, 8)
+        initial_events = (
+            TempoEvent(start_time=Fraction(0), staff_id="__global__", voice_id=0,
+                       bpm=graph.initial_tempo),
+            TimeSignatureEvent(start_time=Fraction(0), staff_id="__global__", voice_id=0,
+                               numerator=num, denominator=denom),
+        )
         
         # Track names
         for staff_id, track in track_map.items():
@@ -116,97 +135,155 @@ class MidiFileBackend(Backend):
         # Sort events
         graph.sort()
         
-        # Process events
-        for event in graph.events:
-            track = track_map.get(event.staff_id, 0)
-            
-            # Convert time from whole notes to beats (quarter notes)
-            time_in_beats = float(event.start_time * 4)
+        # Process events. midiutil's own duplicate removal drops repeated
+        # note-ons but keeps their note-offs, which its deinterleave pass
+        # then trips over, so duplicates are filtered here instead.
+        # Notes are keyed by (track, channel, pitch, start tick): voices that
+        # strike the same key on one channel at once make a single MIDI note,
+        # lasting as long as the longest of them
+        notes: Dict[Tuple[int, int, int, int], Tuple[int, int]] = {}
+        seen: Set[tuple] = set()
+        hairpins: List[DynamicEvent] = []
+        for event in chain(initial_events, graph.events):
+            if isinstance(event, _GLOBAL_EVENT_TYPES):
+                track = 0
+            else:
+                track = track_map.get(event.staff_id, 0)
+            time = self._to_ticks(event.start_time)
             
             if isinstance(event, NoteEvent):
-                duration_in_beats = float(event.effective_duration() * 4)
-                midi.addNote(
-                    track,
-                    event.channel,
-                    event.midi_note,
-                    time_in_beats,
-                    duration_in_beats,
-                    event.velocity,
-                )
-            
-            elif isinstance(event, TempoEvent):
-                midi.addTempo(0, time_in_beats, event.bpm)
+                key = (track, event.channel, event.midi_note, time)
+                duration = self._to_ticks(event.effective_duration())
+                previous = notes.get(key)
+                if previous is None or duration > previous[0]:
+                    notes[key] = (duration, event.velocity)
+                continue
             
-            elif isinstance(event, TimeSignatureEvent):
-                denom_power = {
-                    1: 0, 2: 1, 4: 2, 8: 3, 16: 4, 32: 5
-                }.get(event.denominator, 2)
-                midi.addTimeSignature(
-                    0, time_in_beats,
-                    event.numerator, denom_power, 24, 8
+            handler = self._EVENT_HANDLERS.get(type(event))
+            if handler is not None:
+                # Same kind, track, tick and payload: identical MIDI output
+                key = (handler, track, time) + tuple(
+                    value for name, value in event.__dict__.items()
+                    if name not in _EVENT_PLACEMENT_FIELDS
                 )
-            
-            elif isinstance(event, ProgramChangeEvent):
-                midi.addProgramChange(
-                    track,
-                    event.channel,
-                    time_in_beats,
-                    event.program,
-                )
-            
-            elif isinstance(event, PedalEvent):
-                midi.addControllerEvent(
-                    track,
-                    0,  # Pedal usually on channel 0
-                    time_in_beats,
-                    64,  # Sustain pedal
-                    event.value,
-                )
-            
-            elif isinstance(event, ControlChangeEvent):
-                midi.addControllerEvent(
-                    track,
-                    event.channel,
-                    time_in_beats,
-                    event.controller,
-                    event.value,
-                )
-            
-            elif isinstance(event, DynamicEvent):
-                if event.is_hairpin and event.hairpin_duration and event.target_velocity:
-                    # Generate expression curve for hairpin
-                    self._add_hairpin(
-                        midi, track, 0,
-                        time_in_beats,
-                        float(event.hairpin_duration * 4),
-                        event.velocity,
-                        event.target_velocity,
-                    )
-        
-        # Write file
+                if key not in seen:
+                    seen.add(key)
+                    handler(self, midi, track, event, time)
+            elif isinstance(event, DynamicEvent) and event.is_hairpin:
+                hairpins.append(event)
+        
+        for (track, channel, pitch, time), (duration, velocity) in notes.items():
+            midi.addNote(track, channel, pitch, time, duration, velocity)
+        
+        # Hairpin CC curves span many ticks; adding them after the time-ordered
+        # events keeps each track as two sorted runs for midiutil's final sort
+        for event in hairpins:
+            self._add_dynamic(
+                midi, track_map.get(event.staff_id, 0), event,
+                self._to_ticks(event.start_time),
+            )
+        
+        # Serialize in memory, then write the file in one call
+        buffer = io.BytesIO()
+        midi.writeFile(buffer)
+        
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_path, "wb") as f:
-            midi.writeFile(f)
+            f.write(buffer.getbuffer())
+    
+    def _to_ticks(self, time: Fraction) -> int:
+        """Convert a time in whole notes to integer ticks."""
+        # Exact integer math rather than going through float beats
+        return time.numerator * 4 * self.PPQN // time.denominator
+    
+    def _add_tempo(self, midi: MIDIFile, track: int, event: TempoEvent,
+                   time: int) -> None:
+        midi.addTempo(track, time, event.bpm)
+    
+    def _add_time_signature(self, midi: MIDIFile, track: int,
+                            event: TimeSignatureEvent, time: int) -> None:
+        denom_power = _DENOMINATOR_POWERS.get(event.denominator, 2)
+        midi.addTimeSignature(
+            track, time,
+            event.numerator, denom_power, 24, 8
+        )
+    
+    def _add_program_change(self, midi: MIDIFile, track: int,
+                            event: ProgramChangeEvent, time: int) -> None:
+        midi.addProgramChange(
+            track,
+            event.channel,
+            time,
+            event.program,
+        )
+    
+    def _add_pedal(self, midi: MIDIFile, track: int, event: PedalEvent,
+                   time: int) -> None:
+        midi.addControllerEvent(
+            track,
+            0,  # Pedal usually on channel 0
+            time,
+            64,  # Sustain pedal
+            event.value,
+        )
+    
+    def _add_control_change(self, midi: MIDIFile, track: int,
+                            event: ControlChangeEvent, time: int) -> None:
+        midi.addControllerEvent(
+            track,
+            event.channel,
+            time,
+            event.controller,
+            event.value,
+        )
+    
+    def _add_dynamic(self, midi: MIDIFile, track: int, event: DynamicEvent,
+                     time: int) -> None:
+        if event.is_hairpin and event.hairpin_duration and event.target_velocity:
+            # Generate expression curve for hairpin
+            self._add_hairpin(
+                midi, track, 0,
+                time,
+                self._to_ticks(event.hairpin_duration),
+                event.velocity,
+                event.target_velocity,
+            )
+    
+    # Event type -> handler, looked up once per event
+    _EVENT_HANDLERS = {
+        TempoEvent: _add_tempo,
+        TimeSignatureEvent: _add_time_signature,
+        ProgramChangeEvent: _add_program_change,
+        PedalEvent: _add_pedal,
+        ControlChangeEvent: _add_control_change,
+    }
     
     def _add_hairpin(self, midi: MIDIFile, track: int, channel: int,
-                    start_time: float, duration: float,
+                    start_time: int, duration: int,
                     start_velocity: int, end_velocity: int) -> None:
         """
         Add a hairpin (crescendo/decrescendo) as expression CC events.
         
         Uses CC 11 (Expression) to create a smooth volume change.
+        Times are in ticks.
         """
-        # Number of steps for smooth transition
-        steps = max(8, int(duration * 4))  # At least 8 steps
-        step_duration = duration / steps
-        velocity_step = (end_velocity - start_velocity) / steps
+        start_velocity = max(0, min(127, start_velocity))
+        velocity_delta = max(0, min(127, end_velocity)) - start_velocity
+        
+        # One step per distinct CC value, but no finer than sixteen per beat
+        steps = max(1, min(duration * 16 // self.PPQN, abs(velocity_delta)))
         
+        # Both ends are clamped, so every interpolated value is in range;
+        # the curve is pure integer arithmetic with no per-step rounding
+        previous = None
         for i in range(steps + 1):
-            time = start_time + (i * step_duration)
-            value = int(start_velocity + (i * velocity_step))
-            value = max(0, min(127, value))
+            time = start_time + (i * duration // steps)
+            value = start_velocity + (i * velocity_delta // steps)
+            if value == previous:
+                continue
+            previous = value
             
             midi.addControllerEvent(
                 track,
@@ -3,75 +3,451 @@ Command-line interface for the Clef music language.
 
 Usage:
     clef run score.clef        # Play a score
+    clef watch score.clef      # Replay a score on every save
     clef build score.clef      # Build to MIDI/audio
     clef validate score.clef   # Validate a score
     clef info                  # Show system info
 """
 
+import functools
+import os
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from clef import __version__
-from clef.parser import parse, ClefParseError
-from clef.semantic import analyze, SemanticError
-from clef.engine import compile_score
 
+# Rich, the parser, the analyzer and the engine, and the standard modules
+# only some commands need (hashlib, pickle, tempfile, concurrent.futures),
+# are imported where they are used, so `clef --help` and `clef info` start
+# quickly.
 
-console = Console()
-error_console = Console(stderr=True)
+console = None
+error_console = None
+
+
+def _get_console(stderr: bool = False):
+    """Return the shared stdout (or stderr) console, creating both on first use."""
+    global console, error_console
+    if console is None:
+        from rich.console import Console
+        console = Console()
+        error_console = Console(stderr=True)
+    return error_console if stderr else console
+
+
+# Messages are printed as plain text, not Rich markup, so brackets in a
+# message (or a quoted source line) are shown as written and no markup has
+# to be parsed per call; only the fixed labels are styled.
+
+def _message_line(label: str, style: str, message: str):
+    """A styled label followed by a highlighted plain-text message."""
+    from rich.text import Text
+    console = _get_console()
+    return Text.assemble((label, style), " ", console.render_str(message, markup=False))
 
 
 def print_error(title: str, message: str, context: Optional[str] = None) -> None:
     """Print a formatted error message."""
-    error_text = f"[bold red]{title}[/bold red]\n{message}"
+    from rich.panel import Panel
+    from rich.text import Text
+    error_text = Text.assemble((title, "bold red"), "\n", message)
     if context:
-        error_text += f"\n\n[dim]{context}[/dim]"
-    error_console.print(Panel(error_text, border_style="red", title="Error"))
+        error_text.append("\n\n")
+        error_text.append(context, style="dim")
+    _get_console(stderr=True).print(Panel(error_text, border_style="red", title="Error"))
 
 
 def print_success(message: str) -> None:
     """Print a success message."""
-    console.print(f"[bold green]OK[/bold green] {message}")
+    _get_console().print(_message_line("OK", "bold green", message))
 
 
 def print_warning(message: str) -> None:
     """Print a warning message."""
-    console.print(f"[bold yellow]⚠[/bold yellow] {message}")
+    _get_console().print(_message_line("⚠", "bold yellow", message))
+
+
+def print_warnings(messages) -> None:
+    """Print several warning messages in one console write."""
+    if not messages:
+        return
+    from rich.console import Group
+    _get_console().print(Group(*(
+        _message_line("⚠", "bold yellow", message) for message in messages
+    )))
+
+
+def print_listing(heading: str, messages) -> None:
+    """Print a marked-up heading and a bulleted list in one console write."""
+    from rich.console import Group
+    console = _get_console()
+    console.print(Group(
+        console.render_str(heading),
+        *(_message_line("  •", "", message) for message in messages),
+    ))
+
+
+# Bump when the layout of cache entries changes. Changes to the code that
+# produces them are picked up by _code_fingerprint().
+CACHE_VERSION = 3
+
+# Cache entries kept for each source file, so a few recent versions of a
+# score being edited stay cached, and across all sources
+CACHE_ENTRIES_PER_SOURCE = 8
+CACHE_MAX_ENTRIES = 256
+
+# Package files whose contents determine the cached scores and graphs
+_CACHED_CODE = ("grammar.lark", "parser", "ast", "semantic", "engine")
+
+
+def _cache_dir() -> Path:
+    """Directory holding cached scores and event graphs."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "clef"
+
+
+@functools.lru_cache(maxsize=1)
+def _code_fingerprint() -> bytes:
+    """
+    Identify the installed parser, analyzer and compiler code.
+    
+    Built from the size and modification time of their source files, so
+    editing any of them (or upgrading clef) invalidates the cache without a
+    CACHE_VERSION bump; statting a few files is far cheaper than parsing.
+    """
+    package_dir = Path(__file__).parent
+    parts = [__version__]
+    for name in _CACHED_CODE:
+        path = package_dir / name
+        files = sorted(path.glob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            parts.append(f"{file.relative_to(package_dir)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "\n".join(parts).encode("utf-8")
+
+
+def _cache_key(source: str) -> str:
+    """Cache key for a source text under the installed clef code."""
+    import hashlib
+    digest = hashlib.blake2b(source.encode("utf-8"), digest_size=16)
+    digest.update(_code_fingerprint())
+    return f"{digest.hexdigest()}-{CACHE_VERSION}"
+
+
+def _cache_source_tag(source_path: Path) -> str:
+    """Prefix shared by the cache entries of one source file."""
+    import hashlib
+    path = str(source_path.resolve()).encode("utf-8")
+    return hashlib.blake2b(path, digest_size=8).hexdigest()
+
+
+def _read_cache(path: Path):
+    """Return the cached object, or None on a miss."""
+    import pickle
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated or written by an incompatible version
+        return None
+
+
+def _write_cache(path: Path, result) -> None:
+    """Store a cached object; failures only cost the next run the work."""
+    import pickle
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        # Unwritable cache directory, or a result that cannot be pickled
+        pass
 
 
-def load_and_validate(source_path: Path, strict: bool = True):
+def _prune_cache(source_tag: str) -> None:
+    """
+    Remove the oldest cache entries once there are too many.
+    
+    Keeps the newest CACHE_ENTRIES_PER_SOURCE entries of the given source
+    and the newest CACHE_MAX_ENTRIES overall, so entries left behind by
+    earlier versions of a score (or by files since deleted) do not pile up.
+    """
+    entries = []
+    try:
+        with os.scandir(_cache_dir()) as scan:
+            for entry in scan:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.name))
+                    except OSError:
+                        continue
+    except OSError:
+        return
+    
+    entries.sort(reverse=True)
+    kept = kept_for_source = 0
+    for _, name in entries:
+        if name.startswith(source_tag):
+            kept_for_source += 1
+            stale = kept_for_source > CACHE_ENTRIES_PER_SOURCE
+        else:
+            stale = False
+        if not stale:
+            kept += 1
+            stale = kept > CACHE_MAX_ENTRIES
+        if stale:
+            try:
+                os.unlink(_cache_dir() / name)
+            except OSError:
+                pass
+
+
+def report_error(error: Exception) -> None:
+    """
+    Print an error raised while loading or processing a score.
+    
+    Parse and semantic errors are shown with their source context; anything
+    else is shown by its message.
+    """
+    from clef.parser import ClefParseError
+    from clef.semantic import SemanticError
+    
+    if isinstance(error, ClefParseError):
+        print_error("Parse Error", error.message, error.context)
+    elif isinstance(error, SemanticError):
+        print_error("Semantic Error", error.message, error.context)
+    else:
+        print_error("Error", str(error))
+
+
+def handle_clef_errors(f):
+    """
+    Report any error escaping a command and exit.
+    
+    File system errors (missing output directory, permissions, ...) get a
+    single plain line and status 2; everything else is shown in a panel
+    and exits with status 1.
+    """
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except OSError as e:
+            click.echo(f"clef: {e}", err=True)
+            sys.exit(2)
+        except Exception as e:
+            report_error(e)
+            sys.exit(1)
+    return wrapper
+
+
+@functools.lru_cache(maxsize=4)
+def _get_fluidsynth_backend(soundfont_path: Optional[str]):
+    """
+    Return a FluidSynth backend for a SoundFont, shared within the process.
+    
+    The backend keeps its synthesizer and loaded SoundFont between plays,
+    so reusing it skips reloading the SoundFont from disk.
+    """
+    from clef.backends import FluidSynthBackend
+    return FluidSynthBackend(soundfont_path=soundfont_path)
+
+
+def load_and_validate(source_path: Path, strict: bool = True,
+                      use_cache: bool = True, validate: bool = True):
     """
     Load, parse, and validate a Clef source file.
     
+    Successful results are cached on disk keyed by a hash of the source, so
+    an unchanged file is not parsed and analyzed again by the next command.
+    Set ``CLEF_NO_CACHE`` (or pass ``use_cache=False``) to bypass the cache.
+    With ``validate=False`` semantic analysis is skipped and the returned
+    context is empty.
+    
     Returns:
         Tuple of (score, context) if successful, raises exception otherwise
     """
-    if not source_path.exists():
-        raise FileNotFoundError(f"File not found: {source_path}")
+    score, context, _ = _load(source_path, strict, validate, use_cache, compile=False)
+    return score, context
+
+
+def load_and_compile(source_path: Path, strict: bool = True,
+                     use_cache: bool = True, validate: bool = True,
+                     on_parsed=None):
+    """
+    Load, validate, and compile a Clef source file to an event graph.
+    
+    The event graph is cached alongside the parsed score, so an unchanged
+    file is not compiled again either. ``on_parsed``, if given, is called
+    with no arguments as soon as the score has parsed, so callers can
+    start work that is only worth doing for a readable score.
     
+    Returns:
+        Tuple of (score, context, graph) if successful, raises exception otherwise
+    """
+    return _load(source_path, strict, validate, use_cache, compile=True,
+                 on_parsed=on_parsed)
+
+
+def _load(source_path: Path, strict: bool, validate: bool, use_cache: bool,
+          compile: bool, on_parsed=None):
+    """Shared implementation of load_and_validate and load_and_compile."""
     source = source_path.read_text(encoding="utf-8")
     
-    # Parse
-    try:
+    if not validate:
+        mode = "unvalidated"
+    else:
+        mode = "strict" if strict else "lenient"
+    
+    use_cache = use_cache and not os.environ.get("CLEF_NO_CACHE")
+    cached = None
+    if use_cache:
+        key = _cache_key(source)
+        source_tag = _cache_source_tag(source_path)
+        score_path = _cache_dir() / f"{source_tag}-{key}-{mode}.pkl"
+        graph_path = _cache_dir() / f"{source_tag}-{key}.graph.pkl"
+        cached = _read_cache(score_path)
+    
+    if cached is not None:
+        score, context = cached
+        if on_parsed is not None:
+            on_parsed()
+    else:
+        from clef.parser import parse
+        from clef.semantic.analyzer import analyze, ValidationContext
+        
         score = parse(source, filename=str(source_path))
-    except ClefParseError as e:
-        raise e
+        if on_parsed is not None:
+            on_parsed()
+        if validate:
+            context = analyze(score, strict=strict)
+        else:
+            # Nothing checked, so nothing to report
+            context = ValidationContext()
+        if use_cache:
+            _write_cache(score_path, (score, context))
+            _prune_cache(source_tag)
     
-    # Validate
-    try:
-        context = analyze(score, strict=strict)
-    except SemanticError as e:
-        raise e
+    if not compile:
+        return score, context, None
     
-    return score, context
+    # The event graph depends only on the source, not on how (or whether)
+    # it was validated
+    graph = _read_cache(graph_path) if use_cache else None
+    if graph is None:
+        from clef.engine import compile_score
+        
+        graph = compile_score(score)
+        if use_cache:
+            _write_cache(graph_path, graph)
+            _prune_cache(source_tag)
+    
+    return score, context, graph
+
+
+@contextmanager
+def _progress(console, description: str):
+    """
+    Show a transient spinner while a command works.
+    
+    Yields a function that changes the spinner's description. When the
+    console is not a terminal nothing is drawn, so no refresh thread is
+    started for piped or CI output.
+    """
+    if not console.is_terminal:
+        yield lambda description: None
+        return
+    
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(description, total=None)
+        yield lambda description: progress.update(task, description=description)
+
+
+def _format_time(t) -> str:
+    """Format a whole-note time the way str() formats a Fraction."""
+    # Fractions are kept normalized, so the parts can be printed directly
+    if t.denominator == 1:
+        return str(t.numerator)
+    return f"{t.numerator}/{t.denominator}"
+
+
+# Backslash escapes for the characters that would break a TSV field
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _in_background(fn, *args):
+    """
+    Run fn(*args) in a daemon thread and return a Future for its result.
+    
+    Unlike an executor, a call still running does not hold up interpreter
+    exit, so an error in the foreground is reported straight away.
+    """
+    import threading
+    from concurrent.futures import Future
+    
+    future = Future()
+    
+    def target():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+def _warm_up_backend(backend) -> bool:
+    """Create the synth and load its SoundFont; False if FluidSynth is missing."""
+    if not backend.is_available():
+        return False
+    backend.prepare()
+    return True
+
+
+def _replay(backend, source: Path, console) -> bool:
+    """
+    Stop what is playing and play the current version of a watched score.
+    
+    Errors in the score are reported rather than raised, so watching
+    continues; returns whether the score is playing.
+    """
+    backend.stop()
+    try:
+        score, context, graph = load_and_compile(source)
+        print_warnings(context.warnings)
+    except Exception as e:
+        report_error(e)
+        return False
+    console.print(f"[bold]Playing:[/bold] {source.name}")
+    backend.play(graph, blocking=False)
+    return True
+
+
+# Source files are checked once, by click, before a command runs
+SOURCE_PATH = click.Path(exists=True, dir_okay=False, path_type=Path)
 
 
 @click.group()
@@ -87,12 +463,16 @@ def main():
 
 
 @main.command()
-@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.argument("source", type=SOURCE_PATH)
 @click.option("--soundfont", "-sf", type=click.Path(exists=True),
               help="Path to a SoundFont (.sf2) file")
 @click.option("--no-validate", is_flag=True,
               help="Skip semantic validation")
-def run(source: Path, soundfont: Optional[str], no_validate: bool):
+@click.option("--no-cache", is_flag=True,
+              help="Parse and validate even if a cached result exists")
+@handle_clef_errors
+def run(source: Path, soundfont: Optional[str], no_validate: bool,
+        no_cache: bool):
     """
     Play a Clef score.
     
@@ -100,61 +480,56 @@ def run(source: Path, soundfont: Optional[str], no_validate: bool):
         clef run myscore.clef
         clef run myscore.clef --soundfont ~/soundfonts/piano.sf2
     """
-    try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-            transient=True,
-        ) as progress:
-            # Load and validate
-            task = progress.add_task("Loading score...", total=None)
-            score, context = load_and_validate(source, strict=not no_validate)
-            
-            # Show warnings
-            for warning in context.warnings:
-                print_warning(warning)
-            
-            # Compile
-            progress.update(task, description="Compiling events...")
-            graph = compile_score(score)
-            
-            # Initialize backend
-            progress.update(task, description="Initializing audio...")
-            from clef.backends import FluidSynthBackend
-            backend = FluidSynthBackend(soundfont_path=soundfont)
-            
-            if not backend.is_available():
-                print_error(
-                    "FluidSynth not available",
-                    "Please install pyfluidsynth:\n  pip install pyfluidsynth"
-                )
-                sys.exit(1)
+    console = _get_console()
+    
+    # Start the synth and load the SoundFont once the score has parsed,
+    # while it is validated and compiled
+    backend = _get_fluidsynth_backend(soundfont)
+    warm_up = None
+    
+    def start_warm_up() -> None:
+        nonlocal warm_up
+        warm_up = _in_background(_warm_up_backend, backend)
+    
+    with _progress(console, "Loading score...") as set_status:
+        # Load, validate and compile
+        score, context, graph = load_and_compile(
+            source, validate=not no_validate, use_cache=not no_cache,
+            on_parsed=start_warm_up,
+        )
         
-        # Play
-        console.print(f"\n[bold]Playing:[/bold] {source.name}")
-        console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+        # Show warnings
+        print_warnings(context.warnings)
         
+        # Wait for the backend
+        set_status("Initializing audio...")
         try:
-            backend.play(graph, blocking=True)
-            print_success("Playback complete")
-        except KeyboardInterrupt:
-            backend.stop()
-            console.print("\n[yellow]Playback stopped[/yellow]")
-    
-    except ClefParseError as e:
-        print_error("Parse Error", e.message, e.context)
-        sys.exit(1)
-    except SemanticError as e:
-        print_error("Semantic Error", e.message, e.context)
-        sys.exit(1)
-    except Exception as e:
-        print_error("Error", str(e))
-        sys.exit(1)
+            available = warm_up.result()
+        except Exception:
+            # The warm-up only gives playback a head start; play() sets the
+            # backend up again and reports anything that is still wrong
+            available = True
+        if not available:
+            print_error(
+                "FluidSynth not available",
+                "Please install pyfluidsynth:\n  pip install pyfluidsynth"
+            )
+            sys.exit(1)
+    
+    # Play
+    console.print(f"\n[bold]Playing:[/bold] {source.name}")
+    console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+    
+    try:
+        backend.play(graph, blocking=True)
+        print_success("Playback complete")
+    except KeyboardInterrupt:
+        backend.stop()
+        console.print("\n[yellow]Playback stopped[/yellow]")
 
 
 @main.command()
-@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.argument("source", type=SOURCE_PATH)
 @click.option("--output", "-o", type=click.Path(path_type=Path),
               help="Output file path")
 @click.option("--format", "-f", type=click.Choice(["midi", "wav"]),
@@ -163,8 +538,11 @@ def run(source: Path, soundfont: Optional[str], no_validate: bool):
               help="Path to a SoundFont (.sf2) file (for WAV output)")
 @click.option("--no-validate", is_flag=True,
               help="Skip semantic validation")
+@click.option("--no-cache", is_flag=True,
+              help="Parse and validate even if a cached result exists")
+@handle_clef_errors
 def build(source: Path, output: Optional[Path], format: str,
-          soundfont: Optional[str], no_validate: bool):
+          soundfont: Optional[str], no_validate: bool, no_cache: bool):
     """
     Build a Clef score to MIDI or audio.
     
@@ -173,62 +551,50 @@ def build(source: Path, output: Optional[Path], format: str,
         clef build myscore.clef -o output.mid     # Custom output path
         clef build myscore.clef -f wav            # Render to WAV
     """
-    try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-            transient=True,
-        ) as progress:
-            # Load and validate
-            task = progress.add_task("Loading score...", total=None)
-            score, context = load_and_validate(source, strict=not no_validate)
-            
-            # Show warnings
-            for warning in context.warnings:
-                print_warning(warning)
-            
-            # Compile
-            progress.update(task, description="Compiling events...")
-            graph = compile_score(score)
-            
-            # Determine output path
-            if output is None:
-                suffix = ".mid" if format == "midi" else f".{format}"
-                output = source.with_suffix(suffix)
-            
-            # Export
-            progress.update(task, description=f"Exporting to {format.upper()}...")
-            
-            if format == "midi":
-                from clef.backends import MidiFileBackend
-                backend = MidiFileBackend()
-                backend.export_midi(graph, output)
-            else:
-                from clef.backends import FluidSynthBackend
-                backend = FluidSynthBackend(soundfont_path=soundfont)
-                backend.render(graph, output, format=format)
+    console = _get_console()
+    with _progress(console, "Loading score...") as set_status:
+        # Load, validate and compile
+        score, context, graph = load_and_compile(
+            source, validate=not no_validate, use_cache=not no_cache
+        )
         
-        print_success(f"Built: {output}")
+        # Show warnings
+        print_warnings(context.warnings)
+        
+        # Determine output path
+        if output is None:
+            suffix = ".mid" if format == "midi" else f".{format}"
+            output = source.with_suffix(suffix)
+        
+        # Export
+        set_status(f"Exporting to {format.upper()}...")
+        
+        if format == "midi":
+            from clef.backends import MidiFileBackend
+            backend = MidiFileBackend()
+            backend.export_midi(graph, output)
+        else:
+            backend = _get_fluidsynth_backend(soundfont)
+            backend.render(graph, output, format=format)
     
-    except ClefParseError as e:
-        print_error("Parse Error", e.message, e.context)
-        sys.exit(1)
-    except SemanticError as e:
-        print_error("Semantic Error", e.message, e.context)
-        sys.exit(1)
-    except Exception as e:
-        print_error("Error", str(e))
-        sys.exit(1)
+    print_success(f"Built: {output}")
 
 
 @main.command()
-@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.argument("source", type=SOURCE_PATH)
 @click.option("--strict/--no-strict", default=True,
               help="Stop on first error vs collect all errors")
 @click.option("--show-ast", is_flag=True,
               help="Show the parsed AST")
-def validate(source: Path, strict: bool, show_ast: bool):
+@click.option("--ast-depth", type=click.IntRange(min=0), default=4, show_default=True,
+              help="Levels of the AST to show with --show-ast (0 for all)")
+@click.option("--ast-length", type=click.IntRange(min=0), default=20, show_default=True,
+              help="Items per AST container to show with --show-ast (0 for all)")
+@click.option("--no-cache", is_flag=True,
+              help="Parse and validate even if a cached result exists")
+@handle_clef_errors
+def validate(source: Path, strict: bool, show_ast: bool, ast_depth: int,
+             ast_length: int, no_cache: bool):
     """
     Validate a Clef score without playing.
     
@@ -246,149 +612,174 @@ def validate(source: Path, strict: bool, show_ast: bool):
         clef validate myscore.clef --no-strict  # Show all errors
         clef validate myscore.clef --show-ast   # Debug output
     """
-    try:
-        source_text = source.read_text(encoding="utf-8")
-        
-        # Parse
-        try:
-            score = parse(source_text, filename=str(source))
-        except ClefParseError as e:
-            print_error("Parse Error", e.message, e.context)
-            sys.exit(1)
-        
-        if show_ast:
-            console.print("\n[bold]Abstract Syntax Tree:[/bold]")
-            console.print(score)
-            console.print()
-        
-        # Validate
-        try:
-            context = analyze(score, strict=strict)
-        except SemanticError as e:
-            print_error("Semantic Error", e.message, e.context)
-            sys.exit(1)
-        
-        # Show results
-        if context.errors:
-            console.print(f"\n[red]Found {len(context.errors)} error(s):[/red]")
-            for error in context.errors:
-                console.print(f"  • {error.message}")
-            sys.exit(1)
-        
-        if context.warnings:
-            console.print(f"\n[yellow]Warnings ({len(context.warnings)}):[/yellow]")
-            for warning in context.warnings:
-                console.print(f"  • {warning}")
-        
-        # Success summary
-        table = Table(title=f"Validation: {source.name}", show_header=False)
-        table.add_column("Property", style="cyan")
-        table.add_column("Value")
-        
-        table.add_row("Staves", str(len(score.staves)))
-        
-        total_measures = 0
-        for staff in score.staves:
-            for item in staff.contents:
-                if hasattr(item, 'contents'):
-                    for sub in item.contents:
-                        if hasattr(sub, '__class__') and sub.__class__.__name__ == 'Measure':
-                            total_measures += 1
-        table.add_row("Measures", str(total_measures) if total_measures else "N/A")
-        
-        if score.tempo:
-            table.add_row("Tempo", f"{score.tempo.bpm} BPM")
-        if score.time_signature:
-            table.add_row("Time Signature", str(score.time_signature))
-        if score.key_signature:
-            table.add_row("Key", str(score.key_signature))
+    from rich.table import Table
+    
+    console = _get_console()
+    score, context = load_and_validate(source, strict=strict, use_cache=not no_cache)
+    
+    if show_ast:
+        from rich.pretty import pprint
         
+        console.print("\n[bold]Abstract Syntax Tree:[/bold]")
+        # Large scores have huge trees; show the top of it by default
+        pprint(
+            score,
+            console=console,
+            max_depth=ast_depth or None,
+            max_length=ast_length or None,
+        )
         console.print()
-        console.print(table)
-        print_success("Validation passed!")
     
-    except FileNotFoundError:
-        print_error("File Not Found", f"Cannot find: {source}")
-        sys.exit(1)
-    except Exception as e:
-        print_error("Unexpected Error", str(e))
+    # Show results
+    if context.errors:
+        print_listing(
+            f"\n[red]Found {len(context.errors)} error(s):[/red]",
+            [error.message for error in context.errors],
+        )
         sys.exit(1)
+    
+    if context.warnings:
+        print_listing(
+            f"\n[yellow]Warnings ({len(context.warnings)}):[/yellow]",
+            context.warnings,
+        )
+    
+    # Success summary
+    table = Table(title=f"Validation: {source.name}", show_header=False)
+    table.add_column("Property", style="cyan")
+    table.add_column("Value")
+    
+    table.add_row("Staves", str(len(score.staves)))
+    
+    total_measures = context.total_measures
+    table.add_row("Measures", str(total_measures) if total_measures else "N/A")
+    
+    if score.tempo:
+        table.add_row("Tempo", f"{score.tempo.bpm} BPM")
+    if score.time_signature:
+        table.add_row("Time Signature", str(score.time_signature))
+    if score.key_signature:
+        table.add_row("Key", str(score.key_signature))
+    
+    console.print()
+    console.print(table)
+    print_success("Validation passed!")
 
 
 @main.command()
-def info():
+@click.argument("source", type=SOURCE_PATH)
+@click.option("--soundfont", "-sf", type=click.Path(exists=True),
+              help="Path to a SoundFont (.sf2) file")
+@click.option("--interval", default=0.5, show_default=True,
+              help="Seconds between checks for changes")
+@handle_clef_errors
+def watch(source: Path, soundfont: Optional[str], interval: float):
     """
-    Show system information and available backends.
+    Play a Clef score and replay it whenever the file changes.
+    
+    The synthesizer and SoundFont stay loaded between replays. Errors in
+    the edited file are reported and the previous version stops playing
+    until the file is fixed.
+    
+    Example:
+        clef watch myscore.clef
     """
-    table = Table(title="Clef System Information")
-    table.add_column("Component", style="cyan")
-    table.add_column("Status")
-    table.add_column("Details")
+    console = _get_console()
+    backend = _get_fluidsynth_backend(soundfont)
+    if not backend.is_available():
+        print_error(
+            "FluidSynth not available",
+            "Please install pyfluidsynth:\n  pip install pyfluidsynth"
+        )
+        sys.exit(1)
     
-    # Version
-    table.add_row("Clef Version", __version__, "")
+    console.print(f"\n[bold]Watching:[/bold] {source.name}")
+    console.print("[dim]Press Ctrl+C to stop[/dim]\n")
     
-    # Python
+    last_mtime = None
+    try:
+        while True:
+            try:
+                mtime = source.stat().st_mtime_ns
+            except OSError:
+                # Editors that save atomically replace the file; it may be
+                # missing for a moment, so look again on the next poll
+                mtime = last_mtime
+            if mtime != last_mtime:
+                last_mtime = mtime
+                _replay(backend, source, console)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        backend.stop()
+        console.print("\n[yellow]Stopped watching[/yellow]")
+
+
+def _probe_python() -> Tuple[str, str, str]:
+    """Row for the info table describing the Python interpreter and OS."""
     import platform
-    table.add_row(
-        "Python",
-        f"{platform.python_version()}",
-        platform.platform()
-    )
-    
-    # FluidSynth
+    return ("Python", platform.python_version(), platform.platform())
+
+
+def _probe_fluidsynth() -> Tuple[str, str, str]:
+    """Row for the info table describing FluidSynth support."""
     try:
         import fluidsynth
-        table.add_row(
-            "FluidSynth",
-            "[green]Available[/green]",
-            "pyfluidsynth installed"
-        )
+        return ("FluidSynth", "[green]Available[/green]", "pyfluidsynth installed")
     except (ImportError, OSError, Exception) as e:
-        table.add_row(
+        return (
             "FluidSynth",
             "[red]Not Available[/red]",
             f"pip install pyfluidsynth ({type(e).__name__})"
         )
-    
-    # MidiUtil
+
+
+def _probe_midiutil() -> Tuple[str, str, str]:
+    """Row for the info table describing MIDI export support."""
     try:
         import midiutil
-        table.add_row(
-            "MIDI Export",
-            "[green]Available[/green]",
-            "midiutil installed"
-        )
+        return ("MIDI Export", "[green]Available[/green]", "midiutil installed")
     except ImportError:
-        table.add_row(
-            "MIDI Export",
-            "[red]Not Available[/red]",
-            "pip install midiutil"
-        )
-    
-    # SoundFont
+        return ("MIDI Export", "[red]Not Available[/red]", "pip install midiutil")
+
+
+def _probe_soundfont() -> Tuple[str, str, str]:
+    """Row for the info table describing the SoundFont that would be used."""
     try:
-        from clef.backends.fluidsynth_backend import FluidSynthBackend
-        backend = FluidSynthBackend()
-        sf_path = backend._find_soundfont()
+        sf_path = _get_fluidsynth_backend(None)._find_soundfont()
         if sf_path:
-            table.add_row(
-                "SoundFont",
-                "[green]Found[/green]",
-                sf_path
-            )
-        else:
-            table.add_row(
-                "SoundFont",
-                "[yellow]Not Found[/yellow]",
-                "Set CLEF_SOUNDFONT env var"
-            )
+            return ("SoundFont", "[green]Found[/green]", sf_path)
+        return ("SoundFont", "[yellow]Not Found[/yellow]", "Set CLEF_SOUNDFONT env var")
     except Exception:
-        table.add_row(
-            "SoundFont",
-            "[yellow]Unknown[/yellow]",
-            "FluidSynth not available"
-        )
+        return ("SoundFont", "[yellow]Unknown[/yellow]", "FluidSynth not available")
+
+
+@main.command()
+def info():
+    """
+    Show system information and available backends.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from rich.table import Table
+    
+    console = _get_console()
+    table = Table(title="Clef System Information")
+    table.add_column("Component", style="cyan")
+    table.add_column("Status")
+    table.add_column("Details")
+    
+    # Version
+    table.add_row("Clef Version", __version__, "")
+    
+    # Probes load native libraries, query the OS and search the disk, so
+    # they run side by side; rows are still added in a fixed order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        probes = [
+            executor.submit(probe)
+            for probe in (_probe_python, _probe_fluidsynth, _probe_midiutil,
+                          _probe_soundfont)
+        ]
+        for probe in probes:
+            table.add_row(*probe.result())
     
     console.print()
     console.print(table)
@@ -401,66 +792,86 @@ def info():
 
 
 @main.command()
-@click.argument("source", type=click.Path(exists=True, path_type=Path))
-def events(source: Path):
+@click.argument("source", type=SOURCE_PATH)
+@click.option("--format", "-f", "output_format", type=click.Choice(["table", "tsv"]),
+              default="table", help="Output format (default: table)")
+@click.option("--no-cache", is_flag=True,
+              help="Parse and validate even if a cached result exists")
+@handle_clef_errors
+def events(source: Path, output_format: str, no_cache: bool):
     """
     Debug: Show the event graph for a score.
     
     Displays all events with their precise timing in whole notes.
+    Use --format tsv to stream one tab-separated line per event, with
+    tabs, newlines and backslashes in fields escaped as \\t, \\n and \\\\.
     """
-    try:
-        score, _ = load_and_validate(source)
-        graph = compile_score(score)
-        
-        table = Table(title=f"Events: {source.name}")
-        table.add_column("Time", style="cyan")
-        table.add_column("Type")
-        table.add_column("Staff")
-        table.add_column("Voice")
-        table.add_column("Details")
-        
-        from clef.engine.events import NoteEvent, RestEvent, TempoEvent, PedalEvent
-        
+    score, _, graph = load_and_compile(source, use_cache=not no_cache)
+    
+    from clef.engine.events import NoteEvent, RestEvent, TempoEvent, PedalEvent
+    
+    # Details formatter per event type, looked up once per event instead of
+    # testing each type in turn; other events show no details
+    formatters = {
+        NoteEvent: lambda e: f"MIDI {e.midi_note}, dur={_format_time(e.duration)}, vel={e.velocity}",
+        RestEvent: lambda e: f"dur={_format_time(e.duration)}",
+        TempoEvent: lambda e: f"{e.bpm} BPM",
+        PedalEvent: lambda e: "down" if e.value > 0 else "up",
+    }
+    
+    def rows():
         for event in graph:
-            time_str = str(event.start_time)
-            event_type = event.__class__.__name__.replace("Event", "")
-            
-            if isinstance(event, NoteEvent):
-                details = f"MIDI {event.midi_note}, dur={event.duration}, vel={event.velocity}"
-            elif isinstance(event, RestEvent):
-                details = f"dur={event.duration}"
-            elif isinstance(event, TempoEvent):
-                details = f"{event.bpm} BPM"
-            elif isinstance(event, PedalEvent):
-                details = "down" if event.value > 0 else "up"
-            else:
-                details = ""
-            
-            table.add_row(
-                time_str,
-                event_type,
+            format_details = formatters.get(type(event))
+            yield (
+                _format_time(event.start_time),
+                event.LABEL,
                 event.staff_id,
                 str(event.voice_id),
-                details
+                format_details(event) if format_details else "",
             )
-        
-        console.print()
-        console.print(table)
-        console.print(f"\nTotal events: {len(graph)}")
-        console.print(f"Duration: {graph.get_duration()} whole notes")
     
-    except Exception as e:
-        print_error("Error", str(e))
-        sys.exit(1)
+    if output_format == "tsv":
+        # Written line by line so large graphs never build a table in memory
+        write = sys.stdout.write
+        try:
+            write("time\ttype\tstaff\tvoice\tdetails\n")
+            for row in rows():
+                write("\t".join(field.translate(_TSV_ESCAPES) for field in row) + "\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Reader went away (e.g. piped into head); stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    
+    from rich.table import Table
+    
+    console = _get_console()
+    table = Table(title=f"Events: {source.name}")
+    table.add_column("Time", style="cyan")
+    table.add_column("Type")
+    table.add_column("Staff")
+    table.add_column("Voice")
+    table.add_column("Details")
+    
+    n_events = 0
+    for row in rows():
+        n_events += 1
+        table.add_row(*row)
+    
+    console.print()
+    console.print(table)
+    console.print(f"\nTotal events: {n_events}")
+    console.print(f"Duration: {graph.get_duration()} whole notes")
 
 
 @main.command()
-@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.argument("source", type=SOURCE_PATH)
 @click.option("--output", "-o", type=click.Path(path_type=Path),
               help="Output Clef file path (default: source with .clef extension)")
 @click.option("--dpi", default=300, help="PDF rendering DPI (default: 300)")
 @click.option("--first-page", type=int, help="First page to process (1-indexed)")
 @click.option("--last-page", type=int, help="Last page to process (1-indexed)")
+@handle_clef_errors
 def transcribe(source: Path, output: Optional[Path], dpi: int,
                first_page: Optional[int], last_page: Optional[int]):
     """
@@ -486,6 +897,9 @@ def transcribe(source: Path, output: Optional[Path], dpi: int,
         2. Edit score.clef as needed
         3. clef build score.clef -o output.mid
     """
+    from rich.table import Table
+    
+    console = _get_console()
     try:
         from clef.transcribe import transcribe_pdf, TranscriptionResult
         from clef.transcribe.transcriber import transcribe_musicxml, transcribe_midi
@@ -526,9 +940,7 @@ def transcribe(source: Path, output: Optional[Path], dpi: int,
             sys.exit(1)
         
         # Show results
-        if result.warnings:
-            for warning in result.warnings:
-                print_warning(warning)
+        print_warnings(result.warnings)
         
         if result.errors:
             for error in result.errors:
@@ -556,10 +968,7 @@ def transcribe(source: Path, output: Optional[Path], dpi: int,
                     table.add_row("Key", result.score.key_signature)
                 table.add_row("Staves", str(len(result.score.staves)))
                 
-                total_measures = sum(
-                    len(staff.measures) for staff in result.score.staves
-                )
-                table.add_row("Measures", str(total_measures))
+                table.add_row("Measures", str(result.score.total_measures))
             
             console.print(table)
             console.print()
@@ -586,9 +995,6 @@ def transcribe(source: Path, output: Optional[Path], dpi: int,
             "  Linux:   apt install poppler-utils"
         )
         sys.exit(1)
-    except Exception as e:
-        print_error("Error", str(e))
-        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -2,18 +2,24 @@
 Event compiler for the Clef music language.
 
 Transforms an AST into a time-aligned event graph for playback.
-Uses rational arithmetic throughout to ensure exact timing.
+Timing is exact: positions are kept as integer ticks at a resolution fine
+enough for every duration in the score, and converted to rational whole
+note times on the events.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
 from fractions import Fraction
-from typing import Optional, List, Dict, Tuple, Set, Any
+from functools import lru_cache
+from math import gcd, lcm
+from types import MappingProxyType
+from typing import Optional, List, Dict, FrozenSet, Mapping, Tuple, Set, Any
 
 from clef.ast.nodes import (
     Score,
     Staff,
     Voice,
+    VoiceBlock,
     Measure,
     TimeSignature,
     TempoMark,
@@ -52,8 +58,8 @@ from clef.engine.events import (
 )
 
 
-# General MIDI instrument mapping
-GM_INSTRUMENTS: Dict[str, int] = {
+# General MIDI instrument mapping (read-only, keys are lowercase)
+GM_INSTRUMENTS: Mapping[str, int] = MappingProxyType({
     # Piano
     "piano": 0,
     "acoustic_grand_piano": 0,
@@ -209,14 +215,84 @@ GM_INSTRUMENTS: Dict[str, int] = {
     "helicopter": 125,
     "applause": 126,
     "gunshot": 127,
+})
+
+
+@lru_cache(maxsize=128)
+def _gm_program(instrument: str) -> int:
+    """Return the General MIDI program for an instrument name (0 if unknown)."""
+    return GM_INSTRUMENTS.get(instrument.lower(), 0)
+
+
+# Lowercase articulation names, and the flag sets already built for each
+# combination of articulations (notes share them, so few are ever made)
+_ARTICULATION_NAMES: Dict[ArticulationType, str] = {
+    art_type: art_type.name.lower() for art_type in ArticulationType
 }
+_ARTICULATION_FLAGS: Dict[Tuple[ArticulationType, ...], FrozenSet[str]] = {}
+
+
+def _articulation_flags(articulations: Tuple[Articulation, ...]) -> FrozenSet[str]:
+    """Return the articulation names of a note or chord as a shared frozenset."""
+    key = tuple(art.type for art in articulations)
+    flags = _ARTICULATION_FLAGS.get(key)
+    if flags is None:
+        flags = _ARTICULATION_FLAGS[key] = frozenset(
+            _ARTICULATION_NAMES[art_type] for art_type in key
+        )
+    return flags
+
+
+# Tuplet ratio outside any tuplet; compared by identity to skip the scaling
+_NO_TUPLET: Tuple[int, int] = (1, 1)
+
+
+def _tuplet_ratio(tuplet: Tuplet, outer: Tuple[int, int]) -> Tuple[int, int]:
+    """Combine a tuplet's ratio with the (numerator, denominator) around it."""
+    if not tuplet.actual:
+        # A zero count is reported by the analyzer; its notes take no time
+        return (0, 1)
+    return (outer[0] * tuplet.normal, outer[1] * tuplet.actual)
+
+
+def _timing_resolution(score: Score) -> int:
+    """
+    Ticks per whole note at which every note, chord and rest in a score,
+    scaled by its tuplets, lasts a whole number of ticks.
+    
+    The extra factor of 8 keeps the subdivisions used for grace notes and
+    ornaments (an eighth or a quarter of a note) whole as well.
+    """
+    resolution = 1
+    stack: List[Tuple[Any, Tuple[int, int]]] = [
+        (item, _NO_TUPLET) for staff in score.staves for item in staff.contents
+    ]
+    while stack:
+        item, ratio = stack.pop()
+        if isinstance(item, (Note, Chord, Rest)):
+            value = item.duration.total_value()
+            if ratio is _NO_TUPLET:
+                # Already in lowest terms
+                denominator = value.denominator
+            else:
+                numerator = value.numerator * ratio[0]
+                denominator = value.denominator * ratio[1]
+                denominator //= gcd(numerator, denominator)
+            if resolution % denominator:
+                resolution = lcm(resolution, denominator)
+        elif isinstance(item, Tuplet):
+            inner = _tuplet_ratio(item, ratio)
+            stack.extend((child, inner) for child in item.contents)
+        elif isinstance(item, (Voice, Measure, VoiceBlock, Slur)):
+            stack.extend((child, ratio) for child in item.contents)
+    return 8 * resolution
 
 
 @dataclass
 class CompilerContext:
     """Context for the event compiler."""
-    # Current position in whole notes
-    current_time: Fraction = field(default_factory=lambda: Fraction(0))
+    # Current position in ticks (see EventCompiler.resolution)
+    current_time: int = 0
     
     # Current staff and voice
     staff_id: str = ""
@@ -230,8 +306,9 @@ class CompilerContext:
     # Dynamics
     current_velocity: int = 80
     
-    # Ties: maps (staff, voice, midi) -> NoteEvent for pending ties
-    pending_ties: Dict[Tuple[str, int, int], NoteEvent] = field(default_factory=dict)
+    # Ties: maps (staff, voice, midi) -> index in graph.events of the
+    # NoteEvent awaiting its tied continuation
+    pending_ties: Dict[Tuple[str, int, int], int] = field(default_factory=dict)
     
     # Channel allocation
     next_channel: int = 0
@@ -245,13 +322,41 @@ class EventCompiler:
     """
     Compiles a Clef AST into an event graph.
     
-    The compiler traverses the AST and generates time-aligned events
-    using rational arithmetic to ensure exact timing.
+    The compiler traverses the AST and generates time-aligned events.
+    Positions and durations are tracked as integer ticks, with a per-score
+    resolution at which all of them are whole numbers, so timing stays
+    exact without rational arithmetic on every note.
     """
     
     def __init__(self):
         self.ctx: CompilerContext = CompilerContext()
         self.graph: EventGraph = EventGraph()
+        # Ticks per whole note, and the Fraction already made for each tick
+        self.resolution: int = 8
+        self._times: Dict[int, Fraction] = {}
+        # Latest tempo and time signature emitted at time 0; they are the
+        # ones in effect once events at time 0 are sorted
+        self._start_tempo: Optional[int] = None
+        self._start_time_signature: Optional[Tuple[int, int]] = None
+        
+        # Compile step for each content node type, looked up by exact type.
+        # Timed items also take the ratio of the tuplets around them.
+        self._timed_compilers = {
+            Note: self._compile_note,
+            Chord: self._compile_chord,
+            Rest: self._compile_rest,
+            Tuplet: self._compile_tuplet,
+            Slur: self._compile_slur,
+        }
+        self._untimed_compilers = {
+            Measure: self._compile_measure,
+            Dynamic: self._compile_dynamic,
+            Hairpin: self._compile_hairpin,
+            Pedal: self._compile_pedal,
+            TempoMark: self._compile_tempo,
+            TimeSignature: self._compile_time_signature,
+            InstrumentChange: self._compile_instrument_change,
+        }
     
     def compile(self, score: Score) -> EventGraph:
         """
@@ -265,9 +370,14 @@ class EventCompiler:
         """
         self.ctx = CompilerContext()
         self.graph = EventGraph()
+        self.resolution = _timing_resolution(score)
+        self._times = {}
+        self._start_tempo = None
+        self._start_time_signature = None
         
         # Set initial tempo and time signature
         if score.tempo:
+            self._start_tempo = score.tempo.bpm
             self.ctx.tempo = score.tempo.bpm
             self.graph.initial_tempo = score.tempo.bpm
             self.graph.add(TempoEvent(
@@ -283,6 +393,7 @@ class EventCompiler:
                 score.time_signature.denominator,
             )
             self.graph.initial_time_signature = self.ctx.time_signature
+            self._start_time_signature = self.ctx.time_signature
             self.graph.add(TimeSignatureEvent(
                 start_time=Fraction(0),
                 staff_id="__global__",
@@ -292,14 +403,30 @@ class EventCompiler:
             ))
         
         # Compile each staff
+        self.graph.staff_ids = list(dict.fromkeys(staff.name for staff in score.staves))
         for staff in score.staves:
             self._compile_staff(staff)
         
-        # Sort events by time
-        self.graph.sort()
+        # Sort events by time; every start time is a whole number of ticks
+        self.graph.sort(ticks_per_whole=self.resolution)
         
         return self.graph
     
+    def _time(self, ticks: int) -> Fraction:
+        """Convert ticks to whole notes, sharing one Fraction per value."""
+        time = self._times.get(ticks)
+        if time is None:
+            time = self._times[ticks] = Fraction(ticks, self.resolution)
+        return time
+    
+    def _ticks(self, duration: Duration, ratio: Tuple[int, int]) -> int:
+        """Length of a duration scaled by a tuplet ratio, in ticks."""
+        value = duration.total_value()
+        if ratio is _NO_TUPLET:
+            return self.resolution * value.numerator // value.denominator
+        return (self.resolution * value.numerator * ratio[0]
+                // (value.denominator * ratio[1]))
+    
     def _allocate_channel(self, staff_id: str) -> int:
         """Allocate a MIDI channel for a staff."""
         if staff_id in self.ctx.staff_channels:
@@ -319,11 +446,11 @@ class EventCompiler:
         """Compile a staff into events."""
         self.ctx.staff_id = staff.name
         self.ctx.channel = self._allocate_channel(staff.name)
-        self.ctx.current_time = Fraction(0)
+        self.ctx.current_time = 0
         
         # Set instrument if specified
         if staff.instrument:
-            program = GM_INSTRUMENTS.get(staff.instrument.lower(), 0)
+            program = _gm_program(staff.instrument)
             self.ctx.channel_programs[self.ctx.channel] = program
             self.graph.add(ProgramChangeEvent(
                 start_time=Fraction(0),
@@ -334,148 +461,113 @@ class EventCompiler:
             ))
         
         # Separate voices from direct measures
-        voices: List[Voice] = []
-        direct_content: List[Any] = []
-        
-        for item in staff.contents:
-            if isinstance(item, Voice):
-                voices.append(item)
-            else:
-                direct_content.append(item)
+        direct_content: List[Any] = [
+            item for item in staff.contents if not isinstance(item, Voice)
+        ]
         
         # Compile voices
-        for voice in voices:
+        for voice in staff.voices:
             self._compile_voice(voice)
         
         # Compile direct content as voice 1
         if direct_content:
             self.ctx.voice_id = 1
-            self.ctx.current_time = Fraction(0)
-            for item in direct_content:
-                self._compile_content(item)
+            self.ctx.current_time = 0
+            self._compile_contents(direct_content)
     
     def _compile_voice(self, voice: Voice) -> None:
         """Compile a voice into events."""
         self.ctx.voice_id = voice.number
-        self.ctx.current_time = Fraction(0)
+        self.ctx.current_time = 0
         
-        for item in voice.contents:
-            self._compile_content(item)
+        self._compile_contents(voice.contents)
     
-    def _compile_content(self, item: Any, tuplet_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_contents(self, items: Any,
+                          tuplet_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """
-        Compile a content item into events.
+        Compile a sequence of content items into events.
         
-        Returns the duration consumed.
+        tuplet_ratio is the (numerator, denominator) scaling applied by the
+        enclosing tuplets. Returns the total duration consumed, in ticks.
         """
-        if isinstance(item, Measure):
-            return self._compile_measure(item)
-        elif isinstance(item, Note):
-            return self._compile_note(item, tuplet_ratio)
-        elif isinstance(item, Chord):
-            return self._compile_chord(item, tuplet_ratio)
-        elif isinstance(item, Rest):
-            return self._compile_rest(item, tuplet_ratio)
-        elif isinstance(item, Tuplet):
-            return self._compile_tuplet(item, tuplet_ratio)
-        elif isinstance(item, Slur):
-            return self._compile_slur(item, tuplet_ratio)
-        elif isinstance(item, Dynamic):
-            return self._compile_dynamic(item)
-        elif isinstance(item, Hairpin):
-            return self._compile_hairpin(item)
-        elif isinstance(item, Pedal):
-            return self._compile_pedal(item)
-        elif isinstance(item, TempoMark):
-            return self._compile_tempo(item)
-        elif isinstance(item, TimeSignature):
-            return self._compile_time_signature(item)
-        elif isinstance(item, InstrumentChange):
-            return self._compile_instrument_change(item)
-        else:
-            return Fraction(0)
+        timed = self._timed_compilers.get
+        untimed = self._untimed_compilers.get
+        total_duration = 0
+        for item in items:
+            compile_item = timed(type(item))
+            if compile_item is not None:
+                total_duration += compile_item(item, tuplet_ratio)
+                continue
+            compile_item = untimed(type(item))
+            if compile_item is not None:
+                total_duration += compile_item(item)
+        return total_duration
     
-    def _compile_measure(self, measure: Measure) -> Fraction:
+    def _compile_measure(self, measure: Measure) -> int:
         """Compile a measure into events."""
         start = self.ctx.current_time
+        contents = measure.contents
         
-        # Check if measure contains voice blocks (for synchronized hands)
+        # Most measures have no voice blocks - compile content sequentially
+        if not any(isinstance(item, VoiceBlock) for item in contents):
+            self._compile_contents(contents)
+            return self.ctx.current_time - start
+        
+        # Measure contains voice blocks (for synchronized hands)
         voice_blocks = {}
         other_content = []
         
-        for item in measure.contents:
-            if isinstance(item, tuple) and len(item) == 3 and item[0] == "voice":
-                # This is a voice block within the measure
-                voice_num = item[1]
-                voice_content = item[2]
-                if voice_num not in voice_blocks:
-                    voice_blocks[voice_num] = []
-                voice_blocks[voice_num].append(voice_content)
+        for item in contents:
+            if isinstance(item, VoiceBlock):
+                voice_blocks.setdefault(item.number, []).extend(item.contents)
             else:
                 other_content.append(item)
         
-        if voice_blocks:
-            # Measure contains voice blocks - compile all voices starting at the same time
-            measure_start = self.ctx.current_time
-            saved_voice_id = self.ctx.voice_id
-            
-            # Track the end time for each voice
-            voice_end_times = {}
-            
-            # Compile each voice starting from measure_start
-            for voice_num in sorted(voice_blocks.keys()):
-                self.ctx.voice_id = voice_num
-                self.ctx.current_time = measure_start
-                voice_start = measure_start
-                
-                for voice_item in voice_blocks[voice_num]:
-                    self._compile_content(voice_item)
-                
-                voice_end_times[voice_num] = self.ctx.current_time
-            
-            # Restore voice context
-            self.ctx.voice_id = saved_voice_id
-            
-            # Compile other content (dynamics, pedal, etc.) in the measure at measure_start
-            self.ctx.current_time = measure_start
-            for item in other_content:
-                self._compile_content(item)
+        # Compile all voices starting at the same time
+        saved_voice_id = self.ctx.voice_id
+        max_end = start
+        
+        for voice_num in sorted(voice_blocks.keys()):
+            self.ctx.voice_id = voice_num
+            self.ctx.current_time = start
+            self._compile_contents(voice_blocks[voice_num])
             
             # Measure duration is the maximum end time across all voices
-            max_end = max(voice_end_times.values()) if voice_end_times else measure_start
-            self.ctx.current_time = max_end
-            return max_end - measure_start
-        else:
-            # Normal measure - compile content sequentially
-            for item in measure.contents:
-                self._compile_content(item)
-            return self.ctx.current_time - start
+            max_end = max(max_end, self.ctx.current_time)
+        
+        # Restore voice context
+        self.ctx.voice_id = saved_voice_id
+        
+        # Compile other content (dynamics, pedal, etc.) in the measure at measure start
+        self.ctx.current_time = start
+        self._compile_contents(other_content)
+        
+        self.ctx.current_time = max_end
+        return max_end - start
     
-    def _compile_note(self, note: Note, tuplet_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_note(self, note: Note, tuplet_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """Compile a note into events."""
-        duration = note.duration.total_value() * tuplet_ratio
+        duration = self._ticks(note.duration, tuplet_ratio)
         midi_note = note.pitch.midi_number()
         
         # Compile grace notes first (they steal time from the main note)
-        grace_duration = Fraction(0)
+        grace_duration = 0
         if note.grace_notes:
-            grace_unit = duration * Fraction(1, 8)  # Grace notes take 1/8 of the main note
+            grace_unit = duration // 8  # Grace notes take 1/8 of the main note
             for grace in note.grace_notes:
                 self.graph.add(NoteEvent(
-                    start_time=self.ctx.current_time + grace_duration,
+                    start_time=self._time(self.ctx.current_time + grace_duration),
                     staff_id=self.ctx.staff_id,
                     voice_id=self.ctx.voice_id,
                     midi_note=grace.pitch.midi_number(),
-                    duration=grace_unit,
+                    duration=self._time(grace_unit),
                     velocity=self.ctx.current_velocity,
                     channel=self.ctx.channel,
                 ))
                 grace_duration += grace_unit
         
         # Get articulation flags
-        articulation_flags = frozenset(
-            art.type.name.lower() for art in note.articulations
-        )
+        articulation_flags = _articulation_flags(note.articulations)
         
         # Check for incoming tie
         tie_key = (self.ctx.staff_id, self.ctx.voice_id, midi_note)
@@ -483,34 +575,34 @@ class EventCompiler:
         
         if is_tied_from:
             # Extend the previous note's duration
-            prev_event = self.ctx.pending_ties.pop(tie_key)
+            index = self.ctx.pending_ties.pop(tie_key)
+            prev_event = self.graph.events[index]
             # Create a new event with extended duration
             extended = NoteEvent(
                 start_time=prev_event.start_time,
                 staff_id=prev_event.staff_id,
                 voice_id=prev_event.voice_id,
                 midi_note=prev_event.midi_note,
-                duration=prev_event.duration + duration,
+                duration=prev_event.duration + self._time(duration),
                 velocity=prev_event.velocity,
                 articulations=prev_event.articulations,
                 is_tied_from=prev_event.is_tied_from,
                 is_tied_to=note.tied,
                 channel=prev_event.channel,
             )
-            # Remove old event and add extended
-            self.graph.events = [e for e in self.graph.events if e != prev_event]
-            self.graph.add(extended)
+            # Replace the old event where it stands
+            self.graph.events[index] = extended
             
             if note.tied:
-                self.ctx.pending_ties[tie_key] = extended
+                self.ctx.pending_ties[tie_key] = index
         else:
             # Create new note event
             event = NoteEvent(
-                start_time=self.ctx.current_time + grace_duration,
+                start_time=self._time(self.ctx.current_time + grace_duration),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
                 midi_note=midi_note,
-                duration=duration - grace_duration,
+                duration=self._time(duration - grace_duration),
                 velocity=self.ctx.current_velocity,
                 articulations=articulation_flags,
                 is_tied_from=False,
@@ -520,23 +612,21 @@ class EventCompiler:
             self.graph.add(event)
             
             if note.tied:
-                self.ctx.pending_ties[tie_key] = event
+                self.ctx.pending_ties[tie_key] = len(self.graph.events) - 1
         
         # Handle ornaments (trills, etc.)
         for ornament in note.ornaments:
-            self._apply_ornament(ornament, note, duration)
+            self._apply_ornament(ornament, midi_note, duration)
         
         self.ctx.current_time += duration
         return duration
     
-    def _compile_chord(self, chord: Chord, tuplet_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_chord(self, chord: Chord, tuplet_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """Compile a chord into events."""
-        duration = chord.duration.total_value() * tuplet_ratio
+        duration = self._ticks(chord.duration, tuplet_ratio)
         
         # Get articulation flags
-        articulation_flags = frozenset(
-            art.type.name.lower() for art in chord.articulations
-        )
+        articulation_flags = _articulation_flags(chord.articulations)
         
         for pitch in chord.pitches:
             midi_note = pitch.midi_number()
@@ -544,31 +634,31 @@ class EventCompiler:
             is_tied_from = tie_key in self.ctx.pending_ties
             
             if is_tied_from:
-                prev_event = self.ctx.pending_ties.pop(tie_key)
+                index = self.ctx.pending_ties.pop(tie_key)
+                prev_event = self.graph.events[index]
                 extended = NoteEvent(
                     start_time=prev_event.start_time,
                     staff_id=prev_event.staff_id,
                     voice_id=prev_event.voice_id,
                     midi_note=prev_event.midi_note,
-                    duration=prev_event.duration + duration,
+                    duration=prev_event.duration + self._time(duration),
                     velocity=prev_event.velocity,
                     articulations=prev_event.articulations,
                     is_tied_from=prev_event.is_tied_from,
                     is_tied_to=chord.tied,
                     channel=prev_event.channel,
                 )
-                self.graph.events = [e for e in self.graph.events if e != prev_event]
-                self.graph.add(extended)
+                self.graph.events[index] = extended
                 
                 if chord.tied:
-                    self.ctx.pending_ties[tie_key] = extended
+                    self.ctx.pending_ties[tie_key] = index
             else:
                 event = NoteEvent(
-                    start_time=self.ctx.current_time,
+                    start_time=self._time(self.ctx.current_time),
                     staff_id=self.ctx.staff_id,
                     voice_id=self.ctx.voice_id,
                     midi_note=midi_note,
-                    duration=duration,
+                    duration=self._time(duration),
                     velocity=self.ctx.current_velocity,
                     articulations=articulation_flags,
                     is_tied_from=False,
@@ -578,62 +668,52 @@ class EventCompiler:
                 self.graph.add(event)
                 
                 if chord.tied:
-                    self.ctx.pending_ties[tie_key] = event
+                    self.ctx.pending_ties[tie_key] = len(self.graph.events) - 1
         
         self.ctx.current_time += duration
         return duration
     
-    def _compile_rest(self, rest: Rest, tuplet_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_rest(self, rest: Rest, tuplet_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """Compile a rest into events."""
-        duration = rest.duration.total_value() * tuplet_ratio
+        duration = self._ticks(rest.duration, tuplet_ratio)
         
         self.graph.add(RestEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
-            duration=duration,
+            duration=self._time(duration),
         ))
         
         self.ctx.current_time += duration
         return duration
     
-    def _compile_tuplet(self, tuplet: Tuplet, outer_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_tuplet(self, tuplet: Tuplet, outer_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """Compile a tuplet into events."""
         # Calculate the inner ratio: actual notes in the time of normal
-        inner_ratio = tuplet.ratio() * outer_ratio
-        
-        total_duration = Fraction(0)
-        for item in tuplet.contents:
-            total_duration += self._compile_content(item, inner_ratio)
+        inner_ratio = _tuplet_ratio(tuplet, outer_ratio)
         
-        return total_duration
+        return self._compile_contents(tuplet.contents, inner_ratio)
     
-    def _compile_slur(self, slur: Slur, tuplet_ratio: Fraction = Fraction(1)) -> Fraction:
+    def _compile_slur(self, slur: Slur, tuplet_ratio: Tuple[int, int] = _NO_TUPLET) -> int:
         """Compile a slur into events with legato articulation."""
-        # Save current velocity to restore after
-        total_duration = Fraction(0)
-        
-        for item in slur.contents:
-            duration = self._compile_content(item, tuplet_ratio)
-            total_duration += duration
-        
-        return total_duration
+        return self._compile_contents(slur.contents, tuplet_ratio)
     
-    def _compile_dynamic(self, dynamic: Dynamic) -> Fraction:
+    def _compile_dynamic(self, dynamic: Dynamic) -> int:
         """Compile a dynamic marking."""
-        self.ctx.current_velocity = dynamic.velocity()
+        velocity = dynamic.velocity()
+        self.ctx.current_velocity = velocity
         
         self.graph.add(DynamicEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
             marking=dynamic.marking,
-            velocity=dynamic.velocity(),
+            velocity=velocity,
         ))
         
-        return Fraction(0)  # Dynamics don't consume time
+        return 0  # Dynamics don't consume time
     
-    def _compile_hairpin(self, hairpin: Hairpin) -> Fraction:
+    def _compile_hairpin(self, hairpin: Hairpin) -> int:
         """Compile a hairpin (crescendo/decrescendo)."""
         # Calculate target velocity based on current
         if hairpin.type == HairpinType.CRESCENDO:
@@ -642,7 +722,7 @@ class EventCompiler:
             target = max(20, self.ctx.current_velocity - 30)
         
         self.graph.add(DynamicEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
             marking=hairpin.type.name.lower(),
@@ -652,101 +732,112 @@ class EventCompiler:
             target_velocity=target,
         ))
         
-        return Fraction(0)  # Hairpins don't consume time by themselves
+        return 0  # Hairpins don't consume time by themselves
     
-    def _compile_pedal(self, pedal: Pedal) -> Fraction:
+    def _compile_pedal(self, pedal: Pedal) -> int:
         """Compile a pedal event."""
         if pedal.type == PedalType.DOWN:
             self.graph.add(PedalEvent.down(
-                start_time=self.ctx.current_time,
+                start_time=self._time(self.ctx.current_time),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
             ))
         elif pedal.type == PedalType.UP:
             self.graph.add(PedalEvent.up(
-                start_time=self.ctx.current_time,
+                start_time=self._time(self.ctx.current_time),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
             ))
         elif pedal.type == PedalType.CHANGE:
             # Pedal change: quick up then down
             self.graph.add(PedalEvent.up(
-                start_time=self.ctx.current_time,
+                start_time=self._time(self.ctx.current_time),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
             ))
             self.graph.add(PedalEvent.down(
-                start_time=self.ctx.current_time,
+                start_time=self._time(self.ctx.current_time),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
             ))
         
-        return Fraction(0)
+        return 0
     
-    def _compile_tempo(self, tempo: TempoMark) -> Fraction:
+    def _compile_tempo(self, tempo: TempoMark) -> int:
         """Compile a tempo change."""
         self.ctx.tempo = tempo.bpm
         
+        # A mark restating the tempo already set at the start adds nothing
+        if self.ctx.current_time == 0:
+            if tempo.bpm == self._start_tempo:
+                return 0
+            self._start_tempo = tempo.bpm
+        
         self.graph.add(TempoEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
             bpm=tempo.bpm,
         ))
         
-        return Fraction(0)
+        return 0
     
-    def _compile_time_signature(self, time_sig: TimeSignature) -> Fraction:
+    def _compile_time_signature(self, time_sig: TimeSignature) -> int:
         """Compile a time signature change."""
         self.ctx.time_signature = (time_sig.numerator, time_sig.denominator)
         
+        # Likewise for a time signature restating the one set at the start
+        if self.ctx.current_time == 0:
+            if self.ctx.time_signature == self._start_time_signature:
+                return 0
+            self._start_time_signature = self.ctx.time_signature
+        
         self.graph.add(TimeSignatureEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
             numerator=time_sig.numerator,
             denominator=time_sig.denominator,
         ))
         
-        return Fraction(0)
+        return 0
     
-    def _compile_instrument_change(self, change: InstrumentChange) -> Fraction:
+    def _compile_instrument_change(self, change: InstrumentChange) -> int:
         """Compile an instrument change."""
-        program = GM_INSTRUMENTS.get(change.instrument.lower(), 0)
+        program = _gm_program(change.instrument)
         self.ctx.channel_programs[self.ctx.channel] = program
         
         self.graph.add(ProgramChangeEvent(
-            start_time=self.ctx.current_time,
+            start_time=self._time(self.ctx.current_time),
             staff_id=self.ctx.staff_id,
             voice_id=self.ctx.voice_id,
             program=program,
             channel=self.ctx.channel,
         ))
         
-        return Fraction(0)
+        return 0
     
-    def _apply_ornament(self, ornament: Ornament, note: Note, 
-                       duration: Fraction) -> None:
-        """Apply an ornament to a note, generating additional events."""
+    def _apply_ornament(self, ornament: Ornament, main_note: int,
+                       duration: int) -> None:
+        """Apply an ornament to a note (given by its MIDI number)."""
         if isinstance(ornament, Trill) or ornament.type == OrnamentType.TRILL:
             # Generate trill notes
-            trill_note = note.pitch.midi_number() + 2  # Whole step up by default
+            trill_note = main_note + 2  # Whole step up by default
             if isinstance(ornament, Trill) and ornament.auxiliary_pitch:
                 trill_note = ornament.auxiliary_pitch.midi_number()
             
             # Generate alternating notes
-            trill_unit = duration / 8  # 8 alternations per beat
+            trill_unit = duration // 8  # 8 alternations per beat
             current_pos = self.ctx.current_time - duration  # Go back to start
-            main_note = note.pitch.midi_number()
             
             for i in range(8):
                 pitch = main_note if i % 2 == 0 else trill_note
                 self.graph.add(NoteEvent(
-                    start_time=current_pos,
+                    start_time=self._time(current_pos),
                     staff_id=self.ctx.staff_id,
                     voice_id=self.ctx.voice_id,
                     midi_note=pitch,
-                    duration=trill_unit,
+                    duration=self._time(trill_unit),
                     velocity=self.ctx.current_velocity,
                     channel=self.ctx.channel,
                 ))
@@ -754,28 +845,27 @@ class EventCompiler:
         
         elif ornament.type == OrnamentType.MORDENT:
             # Quick alternation: main -> upper -> main
-            mordent_unit = duration / 8
-            main_note = note.pitch.midi_number()
+            mordent_unit = duration // 8
             upper_note = main_note + 2
             
             start = self.ctx.current_time - duration
             # Main note (short)
             self.graph.add(NoteEvent(
-                start_time=start,
+                start_time=self._time(start),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
                 midi_note=main_note,
-                duration=mordent_unit,
+                duration=self._time(mordent_unit),
                 velocity=self.ctx.current_velocity,
                 channel=self.ctx.channel,
             ))
             # Upper note (short)
             self.graph.add(NoteEvent(
-                start_time=start + mordent_unit,
+                start_time=self._time(start + mordent_unit),
                 staff_id=self.ctx.staff_id,
                 voice_id=self.ctx.voice_id,
                 midi_note=upper_note,
-                duration=mordent_unit,
+                duration=self._time(mordent_unit),
                 velocity=self.ctx.current_velocity,
                 channel=self.ctx.channel,
             ))
@@ -784,8 +874,7 @@ class EventCompiler:
         
         elif ornament.type == OrnamentType.TURN:
             # Turn: upper -> main -> lower -> main
-            turn_unit = duration / 4
-            main_note = note.pitch.midi_number()
+            turn_unit = duration // 4
             upper_note = main_note + 2
             lower_note = main_note - 2
             
@@ -793,16 +882,17 @@ class EventCompiler:
             notes = [upper_note, main_note, lower_note, main_note]
             for i, pitch in enumerate(notes):
                 self.graph.add(NoteEvent(
-                    start_time=start + (turn_unit * i),
+                    start_time=self._time(start + (turn_unit * i)),
                     staff_id=self.ctx.staff_id,
                     voice_id=self.ctx.voice_id,
                     midi_note=pitch,
-                    duration=turn_unit,
+                    duration=self._time(turn_unit),
                     velocity=self.ctx.current_velocity,
                     channel=self.ctx.channel,
                 ))
 
 
+
 def compile_score(score: Score) -> EventGraph:
     """
     Compile a score AST into an event graph.
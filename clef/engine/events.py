@@ -9,7 +9,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from fractions import Fraction
-from typing import Optional, List, Set, FrozenSet
+from typing import ClassVar, Dict, Optional, List, Set, FrozenSet
 
 
 class EventType(Enum):
@@ -34,7 +34,11 @@ class Event:
     - start_time: Absolute position in whole notes from the beginning
     - staff_id: Which staff this event belongs to
     - voice_id: Which voice within the staff
+    
+    Each event class also carries a short display LABEL, such as "Note".
     """
+    LABEL: ClassVar[str] = "Event"
+    
     start_time: Fraction  # Absolute time in whole notes
     staff_id: str
     voice_id: int
@@ -60,6 +64,8 @@ class NoteEvent(Event):
         is_tied_to: Whether this note ties to the next
         channel: MIDI channel (0-15)
     """
+    LABEL: ClassVar[str] = "Note"
+    
     midi_note: int
     duration: Fraction
     velocity: int = 80
@@ -88,6 +94,8 @@ class NoteEvent(Event):
 @dataclass(frozen=True)
 class RestEvent(Event):
     """Represents a rest (silence)."""
+    LABEL: ClassVar[str] = "Rest"
+    
     duration: Fraction
     
     def end_time(self) -> Fraction:
@@ -104,6 +112,8 @@ class TempoEvent(Event):
         bpm: Beats per minute (quarter note = 1 beat)
         beat_unit: The note value that gets one beat (as fraction of whole)
     """
+    LABEL: ClassVar[str] = "Tempo"
+    
     bpm: int
     beat_unit: Fraction = field(default_factory=lambda: Fraction(1, 4))
     
@@ -121,6 +131,8 @@ class TempoEvent(Event):
 @dataclass(frozen=True)
 class TimeSignatureEvent(Event):
     """Represents a time signature change."""
+    LABEL: ClassVar[str] = "TimeSignature"
+    
     numerator: int
     denominator: int
 
@@ -132,6 +144,8 @@ class DynamicEvent(Event):
     
     Affects velocity of subsequent notes until the next dynamic.
     """
+    LABEL: ClassVar[str] = "Dynamic"
+    
     marking: str
     velocity: int
     
@@ -149,6 +163,8 @@ class PedalEvent(Event):
     Attributes:
         value: 0 = up, 127 = down
     """
+    LABEL: ClassVar[str] = "Pedal"
+    
     value: int  # 0-127
     
     @classmethod
@@ -181,6 +197,8 @@ class ProgramChangeEvent(Event):
         program: General MIDI program number (0-127)
         channel: MIDI channel (0-15)
     """
+    LABEL: ClassVar[str] = "ProgramChange"
+    
     program: int
     channel: int = 0
 
@@ -199,11 +217,26 @@ class ControlChangeEvent(Event):
     - 91: Reverb
     - 93: Chorus
     """
+    LABEL: ClassVar[str] = "ControlChange"
+    
     controller: int
     value: int
     channel: int = 0
 
 
+# Sorting priority of events sharing a start time (lower = earlier): tempo and
+# time signature changes come first, notes after the controls that affect
+# them, and anything else last
+_SORT_PRIORITY: Dict[type, int] = {
+    TempoEvent: 0,
+    TimeSignatureEvent: 1,
+    ProgramChangeEvent: 2,
+    DynamicEvent: 3,
+    PedalEvent: 4,
+    NoteEvent: 10,
+}
+
+
 @dataclass
 class EventGraph:
     """
@@ -217,36 +250,53 @@ class EventGraph:
     # Metadata
     initial_tempo: int = 120
     initial_time_signature: tuple = (4, 4)
+    # Staff names in the order the score declares them
+    staff_ids: List[str] = field(default_factory=list)
+    
+    # Number of events when the graph was last sorted. The compiler sorts
+    # once; backends calling sort() again skip the work unless events have
+    # been added since. Not pickled, so a cached graph re-sorts once.
+    _sorted_length: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def add(self, event: Event) -> None:
         """Add an event to the graph."""
         self.events.append(event)
+        self._sorted_length = None
     
     def add_all(self, events: List[Event]) -> None:
         """Add multiple events to the graph."""
         self.events.extend(events)
+        self._sorted_length = None
     
-    def sort(self) -> None:
-        """Sort events by time."""
-        self.events.sort(key=lambda e: (e.start_time, self._event_priority(e)))
-    
-    def _event_priority(self, event: Event) -> int:
-        """Get sorting priority within same time (lower = earlier)."""
-        # Tempo and time sig changes should come first
-        if isinstance(event, TempoEvent):
-            return 0
-        elif isinstance(event, TimeSignatureEvent):
-            return 1
-        elif isinstance(event, ProgramChangeEvent):
-            return 2
-        elif isinstance(event, DynamicEvent):
-            return 3
-        elif isinstance(event, PedalEvent):
-            return 4
-        elif isinstance(event, NoteEvent):
-            return 10
+    def sort(self, ticks_per_whole: Optional[int] = None) -> None:
+        """
+        Sort events by time.
+        
+        Args:
+            ticks_per_whole: A resolution at which every start time is a
+                whole number of ticks. When given, events are sorted on
+                integer tick keys instead of comparing Fractions; the
+                resulting order is the same.
+        """
+        if self._sorted_length == len(self.events):
+            return
+        
+        priority = _SORT_PRIORITY.get
+        if ticks_per_whole is None:
+            def key(event: Event):
+                return (event.start_time, priority(type(event), 20))
         else:
-            return 20
+            def key(event: Event):
+                time = event.start_time
+                return (
+                    time.numerator * ticks_per_whole // time.denominator,
+                    priority(type(event), 20),
+                )
+        
+        self.events.sort(key=key)
+        self._sorted_length = len(self.events)
     
     def get_duration(self) -> Fraction:
         """Get the total duration of the score in whole notes."""
@@ -279,6 +329,11 @@ class EventGraph:
         self.sort()
         return iter(self.events)
     
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_sorted_length", None)
+        return state
+    
     def __len__(self):
         return len(self.events)
 
@@ -5,6 +5,7 @@ Uses Lark to parse Clef source code and transform it into an AST.
 """
 
 from __future__ import annotations
+import sys
 from fractions import Fraction
 from pathlib import Path
 from typing import Optional, Union, List, Any
@@ -17,6 +18,7 @@ from clef.ast.nodes import (
     Score,
     Staff,
     Voice,
+    VoiceBlock,
     Measure,
     TimeSignature,
     TempoMark,
@@ -95,11 +97,14 @@ class ClefTransformer(Transformer):
     def INTEGER(self, token: Token) -> int:
         return int(token.value)
     
+    # Names and markings come from small vocabularies; interning them lets
+    # every node share one string object per distinct value.
+    
     def IDENTIFIER(self, token: Token) -> str:
-        return str(token.value)
+        return sys.intern(str(token.value))
     
     def PITCH_NAME(self, token: Token) -> str:
-        return token.value.upper()
+        return sys.intern(token.value.upper())
     
     def OCTAVE(self, token: Token) -> int:
         return int(token.value)
@@ -115,7 +120,7 @@ class ClefTransformer(Transformer):
         return Fraction(int(parts[0]), int(parts[1]))
     
     def DYNAMIC_MARK(self, token: Token) -> str:
-        return token.value
+        return sys.intern(str(token.value))
     
     def HAIRPIN_TYPE(self, token: Token) -> str:
         return token.value
@@ -130,7 +135,7 @@ class ClefTransformer(Transformer):
         return token.value
     
     def MODE(self, token: Token) -> str:
-        return token.value
+        return sys.intern(str(token.value))
     
     # ========== Pitch ==========
     
@@ -142,7 +147,7 @@ class ClefTransformer(Transformer):
                 accidental = arg
             elif isinstance(arg, int):
                 octave = arg
-        return Pitch(name=name, octave=octave, accidental=accidental)
+        return Pitch.get(name, octave, accidental)
     
     # ========== Duration ==========
     
@@ -150,7 +155,7 @@ class ClefTransformer(Transformer):
         if isinstance(value, str):
             return Duration.from_name(value)
         else:
-            return Duration(base_value=value)
+            return Duration.get(value)
     
     def dotting(self) -> int:
         return 1  # Each dot token represents one dot
@@ -181,7 +186,7 @@ class ClefTransformer(Transformer):
         
         # Apply dots to duration
         if dots > 0:
-            duration = Duration(base_value=duration.base_value, dots=dots)
+            duration = Duration.get(duration.base_value, dots)
         
         return Note(
             pitch=pitch,
@@ -207,7 +212,7 @@ class ClefTransformer(Transformer):
         
         # Apply dots
         if dots > 0:
-            duration = Duration(base_value=duration.base_value, dots=dots)
+            duration = Duration.get(duration.base_value, dots)
         
         return Chord(pitches=tuple(pitches), duration=duration)
     
@@ -258,7 +263,7 @@ class ClefTransformer(Transformer):
     def rest(self, duration: Duration, *dots) -> Rest:
         total_dots = sum(1 for d in dots if d == 1)
         if total_dots > 0:
-            duration = Duration(base_value=duration.base_value, dots=total_dots)
+            duration = Duration.get(duration.base_value, total_dots)
         return Rest(duration=duration)
     
     # ========== Articulations and Ornaments ==========
@@ -337,9 +342,8 @@ class ClefTransformer(Transformer):
     def measure_content(self, item: Any) -> Any:
         return item
     
-    def voice_in_measure(self, number: int, *contents) -> tuple:
-        """Return a tuple (voice_number, contents) for measure-level voice grouping."""
-        return ("voice_in_measure", number, tuple(contents))
+    def voice_in_measure(self, number: int, *contents) -> VoiceBlock:
+        return VoiceBlock(number=number, contents=tuple(contents))
     
     def measure(self, *args) -> Measure:
         number = None
@@ -347,17 +351,6 @@ class ClefTransformer(Transformer):
         for arg in args:
             if isinstance(arg, int) and number is None:
                 number = arg
-            elif isinstance(arg, tuple) and len(arg) == 3 and arg[0] == "voice_in_measure":
-                # Handle voice_in_measure: expand it into the measure contents
-                # with voice context markers
-                voice_num, voice_contents = arg[1], arg[2]
-                for item in voice_contents:
-                    # Mark items with voice number for later processing
-                    if hasattr(item, '__dict__'):
-                        # Store voice info in a way the compiler can access
-                        contents.append(("voice", voice_num, item))
-                    else:
-                        contents.append(("voice", voice_num, item))
             else:
                 contents.append(arg)
         return Measure(contents=tuple(contents), number=number)
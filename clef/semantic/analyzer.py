@@ -9,7 +9,8 @@ and other semantic constraints.
 from __future__ import annotations
 from dataclasses import dataclass, field
 from fractions import Fraction
-from typing import Optional, List, Dict, Set, Tuple, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, FrozenSet, Tuple, Any
 
 from clef.ast.nodes import (
     Node,
@@ -17,6 +18,7 @@ from clef.ast.nodes import (
     Score,
     Staff,
     Voice,
+    VoiceBlock,
     Measure,
     TimeSignature,
     TempoMark,
@@ -58,6 +60,47 @@ class SemanticError(Exception):
         return "".join(parts)
 
 
+# Known instruments for validation. Built once at import; every analysis
+# shares it instead of constructing its own copy.
+KNOWN_INSTRUMENTS: FrozenSet[str] = frozenset({
+    "piano", "acoustic_grand_piano", "bright_acoustic_piano",
+    "electric_grand_piano", "honky_tonk_piano", "electric_piano_1",
+    "electric_piano_2", "harpsichord", "clavinet",
+    "celesta", "glockenspiel", "music_box", "vibraphone",
+    "marimba", "xylophone", "tubular_bells", "dulcimer",
+    "drawbar_organ", "percussive_organ", "rock_organ", "church_organ",
+    "reed_organ", "accordion", "harmonica", "tango_accordion",
+    "acoustic_guitar_nylon", "acoustic_guitar_steel", "electric_guitar_jazz",
+    "electric_guitar_clean", "electric_guitar_muted", "overdriven_guitar",
+    "distortion_guitar", "guitar_harmonics",
+    "acoustic_bass", "electric_bass_finger", "electric_bass_pick",
+    "fretless_bass", "slap_bass_1", "slap_bass_2", "synth_bass_1", "synth_bass_2",
+    "violin", "viola", "cello", "contrabass", "tremolo_strings",
+    "pizzicato_strings", "orchestral_harp", "timpani",
+    "string_ensemble_1", "string_ensemble_2", "synth_strings_1", "synth_strings_2",
+    "choir_aahs", "voice_oohs", "synth_choir", "orchestra_hit",
+    "trumpet", "trombone", "tuba", "muted_trumpet", "french_horn",
+    "brass_section", "synth_brass_1", "synth_brass_2",
+    "soprano_sax", "alto_sax", "tenor_sax", "baritone_sax",
+    "oboe", "english_horn", "bassoon", "clarinet",
+    "piccolo", "flute", "recorder", "pan_flute", "blown_bottle", "shakuhachi", "whistle", "ocarina",
+    "lead_square", "lead_sawtooth", "lead_calliope", "lead_chiff",
+    "lead_charang", "lead_voice", "lead_fifths", "lead_bass",
+    "pad_new_age", "pad_warm", "pad_polysynth", "pad_choir",
+    "pad_bowed", "pad_metallic", "pad_halo", "pad_sweep",
+    "fx_rain", "fx_soundtrack", "fx_crystal", "fx_atmosphere",
+    "fx_brightness", "fx_goblins", "fx_echoes", "fx_sci_fi",
+    "sitar", "banjo", "shamisen", "koto", "kalimba", "bagpipe", "fiddle", "shanai",
+    "tinkle_bell", "agogo", "steel_drums", "woodblock", "taiko_drum",
+    "melodic_tom", "synth_drum", "reverse_cymbal",
+    "guitar_fret_noise", "breath_noise", "seashore", "bird_tweet",
+    "telephone_ring", "helicopter", "applause", "gunshot",
+    # Common short names
+    "strings", "brass", "woodwinds", "organ", "guitar", "bass",
+    "drums", "percussion", "synth", "choir", "voice",
+})
+
+
 @dataclass
 class ValidationContext:
     """Context for validation, tracking state during analysis."""
@@ -70,6 +113,9 @@ class ValidationContext:
     current_voice: Optional[int] = None
     current_measure: Optional[int] = None
     
+    # Number of measures validated, counted as the analyzer walks the score
+    total_measures: int = 0
+    
     # Track tied notes awaiting resolution
     pending_ties: Dict[Tuple[str, int, int], Pitch] = field(default_factory=dict)
     # Key: (staff_name, voice_number, midi_number) -> Pitch
@@ -78,43 +124,7 @@ class ValidationContext:
     pedal_down: bool = False
     
     # Known instruments for validation
-    known_instruments: Set[str] = field(default_factory=lambda: {
-        "piano", "acoustic_grand_piano", "bright_acoustic_piano",
-        "electric_grand_piano", "honky_tonk_piano", "electric_piano_1",
-        "electric_piano_2", "harpsichord", "clavinet",
-        "celesta", "glockenspiel", "music_box", "vibraphone",
-        "marimba", "xylophone", "tubular_bells", "dulcimer",
-        "drawbar_organ", "percussive_organ", "rock_organ", "church_organ",
-        "reed_organ", "accordion", "harmonica", "tango_accordion",
-        "acoustic_guitar_nylon", "acoustic_guitar_steel", "electric_guitar_jazz",
-        "electric_guitar_clean", "electric_guitar_muted", "overdriven_guitar",
-        "distortion_guitar", "guitar_harmonics",
-        "acoustic_bass", "electric_bass_finger", "electric_bass_pick",
-        "fretless_bass", "slap_bass_1", "slap_bass_2", "synth_bass_1", "synth_bass_2",
-        "violin", "viola", "cello", "contrabass", "tremolo_strings",
-        "pizzicato_strings", "orchestral_harp", "timpani",
-        "string_ensemble_1", "string_ensemble_2", "synth_strings_1", "synth_strings_2",
-        "choir_aahs", "voice_oohs", "synth_choir", "orchestra_hit",
-        "trumpet", "trombone", "tuba", "muted_trumpet", "french_horn",
-        "brass_section", "synth_brass_1", "synth_brass_2",
-        "soprano_sax", "alto_sax", "tenor_sax", "baritone_sax",
-        "oboe", "english_horn", "bassoon", "clarinet",
-        "piccolo", "flute", "recorder", "pan_flute", "blown_bottle", "shakuhachi", "whistle", "ocarina",
-        "lead_square", "lead_sawtooth", "lead_calliope", "lead_chiff",
-        "lead_charang", "lead_voice", "lead_fifths", "lead_bass",
-        "pad_new_age", "pad_warm", "pad_polysynth", "pad_choir",
-        "pad_bowed", "pad_metallic", "pad_halo", "pad_sweep",
-        "fx_rain", "fx_soundtrack", "fx_crystal", "fx_atmosphere",
-        "fx_brightness", "fx_goblins", "fx_echoes", "fx_sci_fi",
-        "sitar", "banjo", "shamisen", "koto", "kalimba", "bagpipe", "fiddle", "shanai",
-        "tinkle_bell", "agogo", "steel_drums", "woodblock", "taiko_drum",
-        "melodic_tom", "synth_drum", "reverse_cymbal",
-        "guitar_fret_noise", "breath_noise", "seashore", "bird_tweet",
-        "telephone_ring", "helicopter", "applause", "gunshot",
-        # Common short names
-        "strings", "brass", "woodwinds", "organ", "guitar", "bass",
-        "drums", "percussion", "synth", "choir", "voice",
-    })
+    known_instruments: FrozenSet[str] = KNOWN_INSTRUMENTS
     
     errors: List[SemanticError] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
@@ -204,16 +214,11 @@ class SemanticAnalyzer:
         if staff.instrument:
             self._validate_instrument(staff.instrument, ctx, staff.location)
         
-        # Collect voices and direct measures
-        voices: List[Voice] = []
-        direct_measures: List[Measure] = []
+        voices = staff.voices
+        direct_measures = staff.measures
         
         for item in staff.contents:
-            if isinstance(item, Voice):
-                voices.append(item)
-            elif isinstance(item, Measure):
-                direct_measures.append(item)
-            elif isinstance(item, TimeSignature):
+            if isinstance(item, TimeSignature):
                 ctx.current_time_signature = item
             elif isinstance(item, TempoMark):
                 ctx.current_tempo = item
@@ -241,21 +246,19 @@ class SemanticAnalyzer:
         """Validate a voice."""
         ctx.current_voice = voice.number
         
-        measures: List[Measure] = []
         for item in voice.contents:
-            if isinstance(item, Measure):
-                measures.append(item)
-            elif isinstance(item, TimeSignature):
+            if isinstance(item, TimeSignature):
                 ctx.current_time_signature = item
             elif isinstance(item, TempoMark):
                 ctx.current_tempo = item
         
-        for i, measure in enumerate(measures):
+        for i, measure in enumerate(voice.measures):
             ctx.current_measure = measure.number or (i + 1)
             self._validate_measure(measure, ctx)
     
     def _validate_measure(self, measure: Measure, ctx: ValidationContext) -> None:
         """Validate a measure's duration and contents."""
+        ctx.total_measures += 1
         expected_duration = ctx.current_time_signature.beats_per_measure()
         
         # Check if measure contains voice blocks (for synchronized hands)
@@ -263,13 +266,9 @@ class SemanticAnalyzer:
         other_content = []
         
         for item in measure.contents:
-            if isinstance(item, tuple) and len(item) == 3 and item[0] == "voice":
+            if isinstance(item, VoiceBlock):
                 # This is a voice block within the measure
-                voice_num = item[1]
-                voice_content = item[2]
-                if voice_num not in voice_blocks:
-                    voice_blocks[voice_num] = []
-                voice_blocks[voice_num].append(voice_content)
+                voice_blocks.setdefault(item.number, []).extend(item.contents)
             else:
                 other_content.append(item)
         
@@ -471,8 +470,7 @@ class SemanticAnalyzer:
     
     def _validate_dynamic(self, dynamic: Dynamic, ctx: ValidationContext) -> None:
         """Validate dynamic marking."""
-        valid_dynamics = {"ppp", "pp", "p", "mp", "mf", "f", "ff", "fff", "fp", "sfz", "sf"}
-        if dynamic.marking not in valid_dynamics:
+        if dynamic.marking not in Dynamic.VELOCITIES:
             self._add_error(
                 ctx,
                 f"Unknown dynamic marking: {dynamic.marking}",
@@ -488,17 +486,16 @@ class SemanticAnalyzer:
                 f"Unknown instrument '{instrument}' - will use default piano sound"
             )
     
-    def _validate_voice_alignment(self, voices: List[Voice], ctx: ValidationContext) -> None:
+    def _validate_voice_alignment(self, voices: Tuple[Voice, ...], ctx: ValidationContext) -> None:
         """Validate that all voices have the same total duration."""
         voice_durations: Dict[int, Fraction] = {}
         
         for voice in voices:
             ctx.current_voice = voice.number
             total = Fraction(0)
-            for item in voice.contents:
-                if isinstance(item, Measure):
-                    for content in item.contents:
-                        total += self._get_item_duration(content, ctx)
+            for measure in voice.measures:
+                for content in measure.contents:
+                    total += self._get_item_duration(content, ctx)
             voice_durations[voice.number] = total
         
         # Check all voices have same duration
@@ -511,11 +508,18 @@ class SemanticAnalyzer:
             )
 
 
+@lru_cache(maxsize=2)
+def _get_analyzer(strict: bool) -> SemanticAnalyzer:
+    """Return the shared analyzer for a strictness mode."""
+    # Analyzers keep no state between runs, so one per mode is reused
+    return SemanticAnalyzer(strict=strict)
+
+
 def analyze(score: Score, strict: bool = True) -> ValidationContext:
     """
     Analyze a score for semantic correctness.
     
-    This is a convenience function that creates an analyzer and runs it.
+    This is a convenience function that runs a shared analyzer.
     
     Args:
         score: The parsed Score AST
@@ -527,6 +531,5 @@ def analyze(score: Score, strict: bool = True) -> ValidationContext:
     Raises:
         SemanticError: If strict mode and errors found
     """
-    analyzer = SemanticAnalyzer(strict=strict)
-    return analyzer.analyze(score)
+    return _get_analyzer(strict).analyze(score)
 
@@ -4,7 +4,7 @@ Clef Code Generator
 Converts recognized music data into Clef source code.
 """
 
-from typing import List, Optional, TextIO
+from typing import Dict, FrozenSet, List, Optional, TextIO
 from io import StringIO
 
 from .omr import (
@@ -17,6 +17,44 @@ from .omr import (
 )
 
 
+# Common instrument names -> GM names
+_GM_INSTRUMENT_NAMES: Dict[str, str] = {
+    "piano": "piano",
+    "acoustic grand piano": "piano",
+    "grand piano": "piano",
+    "violin": "violin",
+    "viola": "viola",
+    "cello": "cello",
+    "violoncello": "cello",
+    "flute": "flute",
+    "clarinet": "clarinet",
+    "oboe": "oboe",
+    "bassoon": "bassoon",
+    "trumpet": "trumpet",
+    "horn": "french_horn",
+    "french horn": "french_horn",
+    "trombone": "trombone",
+    "tuba": "tuba",
+    "guitar": "acoustic_guitar_nylon",
+    "acoustic guitar": "acoustic_guitar_nylon",
+    "electric guitar": "electric_guitar_clean",
+    "bass": "acoustic_bass",
+    "electric bass": "electric_bass_finger",
+    "organ": "church_organ",
+    "harpsichord": "harpsichord",
+    "harp": "harp",
+    "timpani": "timpani",
+    "xylophone": "xylophone",
+    "vibraphone": "vibraphone",
+    "marimba": "marimba",
+}
+
+# Dynamic markings Clef understands
+_CLEF_DYNAMICS: FrozenSet[str] = frozenset({
+    "ppp", "pp", "p", "mp", "mf", "f", "ff", "fff", "sfz", "sf", "fp",
+})
+
+
 class ClefCodeGenerator:
     """Generates Clef source code from recognized music data."""
     
@@ -264,56 +302,11 @@ class ClefCodeGenerator:
         if not instrument:
             return "piano"
         
-        # Map common instrument names to GM names
-        instrument_map = {
-            "piano": "piano",
-            "acoustic grand piano": "piano",
-            "grand piano": "piano",
-            "violin": "violin",
-            "viola": "viola",
-            "cello": "cello",
-            "violoncello": "cello",
-            "flute": "flute",
-            "clarinet": "clarinet",
-            "oboe": "oboe",
-            "bassoon": "bassoon",
-            "trumpet": "trumpet",
-            "horn": "french_horn",
-            "french horn": "french_horn",
-            "trombone": "trombone",
-            "tuba": "tuba",
-            "guitar": "acoustic_guitar_nylon",
-            "acoustic guitar": "acoustic_guitar_nylon",
-            "electric guitar": "electric_guitar_clean",
-            "bass": "acoustic_bass",
-            "electric bass": "electric_bass_finger",
-            "organ": "church_organ",
-            "harpsichord": "harpsichord",
-            "harp": "harp",
-            "timpani": "timpani",
-            "xylophone": "xylophone",
-            "vibraphone": "vibraphone",
-            "marimba": "marimba",
-        }
-        
         inst_lower = instrument.lower().strip()
-        return instrument_map.get(inst_lower, "piano")
+        return _GM_INSTRUMENT_NAMES.get(inst_lower, "piano")
     
     def _convert_dynamic(self, dynamic: str) -> Optional[str]:
         """Convert dynamic marking to Clef format."""
-        dynamic_map = {
-            "ppp": "ppp",
-            "pp": "pp",
-            "p": "p",
-            "mp": "mp",
-            "mf": "mf",
-            "f": "f",
-            "ff": "ff",
-            "fff": "fff",
-            "sfz": "sfz",
-            "sf": "sf",
-            "fp": "fp",
-        }
-        
-        return dynamic_map.get(dynamic.lower().strip())
+        marking = dynamic.lower().strip()
+        return marking if marking in _CLEF_DYNAMICS else None
 
@@ -11,7 +11,6 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 from fractions import Fraction
-from PIL import Image
 import tempfile
 import os
 
@@ -84,22 +83,29 @@ class RecognizedScore:
     time_signature: Optional[Tuple[int, int]] = None
     key_signature: Optional[str] = None
     staves: List[RecognizedStaff] = field(default_factory=list)
+    
+    @property
+    def total_measures(self) -> int:
+        """Number of measures across all staves."""
+        return sum(len(staff.measures) for staff in self.staves)
+
+
+# music21 duration type -> Clef duration name
+_CLEF_DURATIONS: Dict[str, str] = {
+    "whole": "w",
+    "half": "h",
+    "quarter": "q",
+    "eighth": "e",
+    "16th": "s",
+    "32nd": "t",
+    "64th": "x",
+    "breve": "d",  # double whole
+}
 
 
 def _duration_to_clef(duration_type: str, dots: int = 0) -> str:
     """Convert music21 duration type to Clef duration."""
-    duration_map = {
-        "whole": "w",
-        "half": "h",
-        "quarter": "q",
-        "eighth": "e",
-        "16th": "s",
-        "32nd": "t",
-        "64th": "x",
-        "breve": "d",  # double whole
-    }
-    
-    base = duration_map.get(duration_type, "q")
+    base = _CLEF_DURATIONS.get(duration_type, "q")
     # Ensure dots is an integer
     if not isinstance(dots, int):
         dots = int(dots) if dots else 0
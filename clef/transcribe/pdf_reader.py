@@ -4,12 +4,18 @@ PDF to Image Conversion
 Converts PDF pages to PIL Images for OMR processing.
 """
 
+from __future__ import annotations
+
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image
+from typing import TYPE_CHECKING, List, Optional
 import tempfile
 import os
 
+if TYPE_CHECKING:
+    # Pillow is only needed once pages are actually rendered, which
+    # pdf2image does itself; MIDI and MusicXML transcription never load it
+    from PIL import Image
+
 
 def pdf_to_images(
     pdf_path: str,
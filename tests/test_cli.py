@@ -0,0 +1,419 @@
+"""
+Unit tests for the Clef command-line interface.
+"""
+
+import os
+import pytest
+from unittest.mock import Mock
+
+from click.testing import CliRunner
+
+import clef.parser
+from clef import cli
+
+
+SCORE = """
+score {
+    tempo 120
+    time 4/4
+    staff piano {
+        voice 1 {
+            measure {
+                C4 q
+                D4 q
+                E4 h
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Point the score cache at a fresh directory for each test."""
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.delenv("CLEF_NO_CACHE", raising=False)
+    return cache_home
+
+
+@pytest.fixture
+def score_file(tmp_path):
+    """A valid score on disk."""
+    path = tmp_path / "score.clef"
+    path.write_text(SCORE, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def broken_file(tmp_path):
+    """A score with a syntax error on disk."""
+    path = tmp_path / "broken.clef"
+    path.write_text(SCORE.replace("D4 q", "D4 ?"), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """A stand-in for the FluidSynth backend, used by the playing commands."""
+    backend = Mock()
+    backend.is_available.return_value = True
+    monkeypatch.setattr(cli, "_get_fluidsynth_backend", lambda soundfont: backend)
+    return backend
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Record each time a score is actually parsed rather than loaded from cache."""
+    calls = []
+    real_parse = clef.parser.parse
+    
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return real_parse(*args, **kwargs)
+    
+    monkeypatch.setattr(clef.parser, "parse", counting_parse)
+    return calls
+
+
+def invoke(*args):
+    """Run the clef command line with the given arguments."""
+    return CliRunner().invoke(cli.main, [str(arg) for arg in args])
+
+
+class TestCache:
+    """Test caching of parsed scores and event graphs."""
+    
+    def test_cache_hit(self, score_file, parse_calls, cache_home):
+        """Test that an unchanged score is loaded from the cache."""
+        assert invoke("validate", score_file).exit_code == 0
+        assert len(parse_calls) == 1
+        assert list((cache_home / "clef").glob("*.pkl"))
+        
+        result = invoke("validate", score_file)
+        
+        assert result.exit_code == 0
+        assert len(parse_calls) == 1
+    
+    def test_source_change_invalidates(self, score_file, parse_calls):
+        """Test that editing the score parses it again."""
+        assert invoke("validate", score_file).exit_code == 0
+        
+        score_file.write_text(SCORE.replace("tempo 120", "tempo 90"), encoding="utf-8")
+        result = invoke("validate", score_file)
+        
+        assert result.exit_code == 0
+        assert "90 BPM" in result.output
+        assert len(parse_calls) == 2
+    
+    def test_corrupt_entry_recompiles(self, score_file, parse_calls, cache_home):
+        """Test that an unreadable cache entry falls back to a fresh compile."""
+        assert invoke("events", score_file, "--format", "tsv").exit_code == 0
+        entries = list((cache_home / "clef").glob("*.pkl"))
+        assert len(entries) == 2  # parsed score and event graph
+        for entry in entries:
+            entry.write_bytes(b"not a pickle")
+        
+        result = invoke("events", score_file, "--format", "tsv")
+        
+        assert result.exit_code == 0
+        assert len(parse_calls) == 2
+        assert len(result.output.splitlines()) == 1 + 5  # header, events
+    
+    def test_no_cache_option(self, score_file, parse_calls):
+        """Test that --no-cache always parses."""
+        assert invoke("validate", score_file).exit_code == 0
+        assert invoke("validate", score_file, "--no-cache").exit_code == 0
+        assert len(parse_calls) == 2
+    
+    def test_prune_old_versions(self, tmp_path, score_file, cache_home, monkeypatch):
+        """Test that only the newest entries of each source are kept."""
+        monkeypatch.setattr(cli, "CACHE_ENTRIES_PER_SOURCE", 2)
+        other_file = tmp_path / "other.clef"
+        other_file.write_text(SCORE, encoding="utf-8")
+        assert invoke("validate", other_file).exit_code == 0
+        
+        for bpm in (60, 70, 80, 90):
+            score_file.write_text(
+                SCORE.replace("tempo 120", f"tempo {bpm}"), encoding="utf-8"
+            )
+            assert invoke("validate", score_file).exit_code == 0
+        
+        score_tag = cli._cache_source_tag(score_file)
+        other_tag = cli._cache_source_tag(other_file)
+        names = [entry.name for entry in (cache_home / "clef").glob("*.pkl")]
+        assert len([name for name in names if name.startswith(score_tag)]) == 2
+        assert len([name for name in names if name.startswith(other_tag)]) == 1
+
+
+class TestWatch:
+    """Test replaying a watched score."""
+    
+    def test_replay(self, score_file, backend):
+        """Test that a replay stops the old version and plays the new one."""
+        assert cli._replay(backend, score_file, cli._get_console())
+        
+        backend.stop.assert_called_once_with()
+        backend.play.assert_called_once()
+        graph = backend.play.call_args.args[0]
+        assert len(graph.get_note_events()) == 3
+        assert backend.play.call_args.kwargs == {"blocking": False}
+    
+    def test_replay_with_source_error(self, broken_file, backend, capsys):
+        """Test that an error in the score is reported, not raised."""
+        assert not cli._replay(backend, broken_file, cli._get_console())
+        
+        backend.stop.assert_called_once_with()
+        backend.play.assert_not_called()
+        assert "Parse Error" in capsys.readouterr().err
+    
+    def test_watch_continues_after_error(self, broken_file, backend, monkeypatch):
+        """Test that watching carries on until the score is fixed."""
+        polls = []
+        
+        def fake_sleep(seconds):
+            polls.append(seconds)
+            if len(polls) == 1:
+                broken_file.write_text(SCORE, encoding="utf-8")
+                mtime = broken_file.stat().st_mtime_ns + 1_000_000_000
+                os.utime(broken_file, ns=(mtime, mtime))
+            else:
+                raise KeyboardInterrupt
+        
+        monkeypatch.setattr(cli.time, "sleep", fake_sleep)
+        
+        result = invoke("watch", broken_file, "--interval", "0.1")
+        
+        assert result.exit_code == 0
+        assert "Parse Error" in result.output
+        assert "Stopped watching" in result.output
+        assert polls == [0.1, 0.1]
+        backend.play.assert_called_once()
+
+
+class TestEventsTsv:
+    """Test the tab-separated event listing."""
+    
+    def test_header_and_columns(self, score_file):
+        """Test the header row and the order of the columns."""
+        result = invoke("events", score_file, "--format", "tsv")
+        
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert lines[0] == "time\ttype\tstaff\tvoice\tdetails"
+        assert lines[1:] == [
+            "0\tTempo\t__global__\t0\t120 BPM",
+            "0\tTimeSignature\t__global__\t0\t",
+            "0\tNote\tpiano\t1\tMIDI 60, dur=1/4, vel=80",
+            "1/4\tNote\tpiano\t1\tMIDI 62, dur=1/4, vel=80",
+            "1/2\tNote\tpiano\t1\tMIDI 64, dur=1/2, vel=80",
+        ]
+    
+    def test_field_escaping(self, score_file, monkeypatch):
+        """Test that tabs, newlines and backslashes in a field are escaped."""
+        from fractions import Fraction
+        from clef.engine.events import EventGraph, RestEvent
+        
+        graph = EventGraph()
+        graph.add(RestEvent(
+            start_time=Fraction(0), staff_id="left\tright\nnext\\", voice_id=1,
+            duration=Fraction(1, 4),
+        ))
+        monkeypatch.setattr(
+            cli, "load_and_compile", lambda *args, **kwargs: (None, None, graph)
+        )
+        
+        result = invoke("events", score_file, "--format", "tsv")
+        
+        assert result.exit_code == 0
+        assert result.output.splitlines()[1:] == [
+            "0\tRest\tleft\\tright\\nnext\\\\\t1\tdur=1/4",
+        ]
+
+
+class TestShowAst:
+    """Test the size limits on the AST shown by validate --show-ast."""
+    
+    def test_default_depth_truncates(self, score_file):
+        """Test that the tree is cut off below the default depth."""
+        result = invoke("validate", score_file, "--show-ast")
+        
+        assert result.exit_code == 0
+        assert "Voice(...)" in result.output
+        assert "name='C'" not in result.output
+    
+    def test_zero_depth_shows_all(self, score_file):
+        """Test that a depth of 0 shows the whole tree."""
+        result = invoke("validate", score_file, "--show-ast", "--ast-depth", "0")
+        
+        assert result.exit_code == 0
+        assert "Voice(...)" not in result.output
+        assert "name='C'" in result.output
+        assert "name='E'" in result.output
+    
+    def test_length_truncates(self, score_file):
+        """Test that containers show only the first items of a limited length."""
+        result = invoke(
+            "validate", score_file, "--show-ast", "--ast-depth", "0",
+            "--ast-length", "2",
+        )
+        
+        assert result.exit_code == 0
+        assert "name='D'" in result.output
+        assert "name='E'" not in result.output
+        assert "... +1" in result.output
+    
+    @pytest.mark.parametrize("option", ["--ast-depth", "--ast-length"])
+    def test_negative_limit_rejected(self, score_file, option):
+        """Test that negative limits are a usage error."""
+        result = invoke("validate", score_file, "--show-ast", option, "-1")
+        
+        assert result.exit_code == 2
+        assert "Invalid value" in result.output
+
+
+class TestNoValidate:
+    """Test building without semantic validation."""
+    
+    @pytest.fixture
+    def invalid_file(self, tmp_path):
+        """A score that parses but whose measure is a beat short."""
+        path = tmp_path / "short.clef"
+        path.write_text(SCORE.replace("E4 h", "E4 q"), encoding="utf-8")
+        return path
+    
+    def test_semantic_errors_stop_build(self, invalid_file, tmp_path):
+        """Test that a build with validation fails on a semantic error."""
+        output = tmp_path / "short.mid"
+        
+        result = invoke("build", invalid_file, "-o", output)
+        
+        assert result.exit_code == 1
+        assert "Semantic Error" in result.output
+        assert not output.exists()
+    
+    def test_semantic_errors_build_without_validation(self, invalid_file, tmp_path):
+        """Test that --no-validate compiles a score with semantic errors."""
+        output = tmp_path / "short.mid"
+        
+        result = invoke("build", invalid_file, "-o", output, "--no-validate")
+        
+        assert result.exit_code == 0
+        assert output.read_bytes().startswith(b"MThd")
+    
+    def test_analysis_skipped(self, score_file, tmp_path, monkeypatch):
+        """Test that --no-validate never runs the analyzer."""
+        import clef.semantic.analyzer
+        
+        def fail_analyze(*args, **kwargs):
+            raise AssertionError("analyze() called")
+        
+        monkeypatch.setattr(clef.semantic.analyzer, "analyze", fail_analyze)
+        
+        result = invoke(
+            "build", score_file, "-o", tmp_path / "score.mid", "--no-validate",
+        )
+        
+        assert result.exit_code == 0
+        assert invoke("build", score_file, "-o", tmp_path / "score.mid").exit_code == 1
+
+
+class TestErrorHandling:
+    """Test how errors escaping a command are reported."""
+    
+    def test_unwritable_output(self, score_file, tmp_path):
+        """Test that a file system error exits with status 2 and one line."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("", encoding="utf-8")
+        
+        result = invoke("build", score_file, "-o", blocker / "score.mid")
+        
+        assert result.exit_code == 2
+        assert result.output.startswith("clef: ")
+        assert "blocker" in result.output
+        assert "Error" not in result.output
+    
+    def test_missing_input(self, tmp_path):
+        """Test that a missing source file is a usage error."""
+        result = invoke("build", tmp_path / "missing.clef")
+        
+        assert result.exit_code == 2
+        assert "does not exist" in result.output
+    
+    def test_parse_error(self, broken_file):
+        """Test that a syntax error is shown in a panel with status 1."""
+        result = invoke("validate", broken_file)
+        
+        assert result.exit_code == 1
+        assert "Parse Error" in result.output
+    
+    def test_semantic_error(self, score_file):
+        """Test that a semantic error is shown in a panel with status 1."""
+        score_file.write_text(SCORE.replace("E4 h", "E4 q"), encoding="utf-8")
+        
+        result = invoke("validate", score_file)
+        
+        assert result.exit_code == 1
+        assert "Semantic Error" in result.output
+    
+    def test_unexpected_error(self, score_file, monkeypatch):
+        """Test that any other error is shown by its message with status 1."""
+        def fail(*args, **kwargs):
+            raise ValueError("something went wrong")
+        
+        monkeypatch.setattr(cli, "load_and_compile", fail)
+        
+        result = invoke("events", score_file)
+        
+        assert result.exit_code == 1
+        assert "something went wrong" in result.output
+
+
+class TestRun:
+    """Test playing a score with the backend warmed up in the background."""
+    
+    def test_plays_after_warm_up(self, score_file, backend):
+        """Test that the backend is prepared and then plays the score."""
+        result = invoke("run", score_file)
+        
+        assert result.exit_code == 0
+        backend.prepare.assert_called_once_with()
+        backend.play.assert_called_once()
+        assert backend.play.call_args.kwargs == {"blocking": True}
+        assert "Playback complete" in result.output
+    
+    def test_prepare_failure_still_plays(self, score_file, backend):
+        """Test that a failed warm-up is left for play() to deal with."""
+        from clef.backends import BackendError
+        
+        backend.prepare.side_effect = BackendError("No SoundFont found")
+        
+        result = invoke("run", score_file)
+        
+        assert result.exit_code == 0
+        backend.play.assert_called_once()
+        assert "Playback complete" in result.output
+    
+    def test_play_failure_reported(self, score_file, backend):
+        """Test that an error from play() itself is reported once."""
+        from clef.backends import BackendError
+        
+        backend.prepare.side_effect = BackendError("No SoundFont found")
+        backend.play.side_effect = BackendError("No SoundFont found")
+        
+        result = invoke("run", score_file)
+        
+        assert result.exit_code == 1
+        assert result.output.count("No SoundFont found") == 1
+    
+    def test_fluidsynth_missing(self, score_file, backend):
+        """Test that a missing FluidSynth is reported before playing."""
+        backend.is_available.return_value = False
+        
+        result = invoke("run", score_file)
+        
+        assert result.exit_code == 1
+        assert "FluidSynth not available" in result.output
+        backend.prepare.assert_not_called()
+        backend.play.assert_not_called()
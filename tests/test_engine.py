@@ -73,6 +73,32 @@ class TestEventCompilation:
         assert note_events[2].midi_note == 64  # E4
         assert note_events[3].midi_note == 65  # F4
     
+    def test_accidental_midi_numbers(self):
+        """Test MIDI note numbers for accidentals."""
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        C#4 q
+                        Bb3 q
+                        F##4 q
+                        Ebb4 q
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+
+        note_events = graph.get_note_events()
+        assert note_events[0].midi_note == 61  # C#4
+        assert note_events[1].midi_note == 58  # Bb3
+        assert note_events[2].midi_note == 67  # F##4
+        assert note_events[3].midi_note == 62  # Ebb4
+
     def test_rest_events(self):
         """Test compiling rests."""
         source = """
@@ -142,6 +168,42 @@ class TestTupletCompilation:
         
         # F4 starts after the triplet (1/4 beat)
         assert note_events[3].start_time == Fraction(1, 4)
+    
+    def test_nested_tuplet_with_dotted_note(self):
+        """Test exact timing for dotted notes inside nested tuplets."""
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        tuplet 3 in 2 {
+                            C4 q.
+                            tuplet 5 in 4 {
+                                D4 s
+                                E4 s
+                                F4 s
+                                G4 s
+                                A4 s
+                            }
+                            B4 q
+                        }
+                        C5 h
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        note_events = graph.get_note_events()
+        assert note_events[0].duration == Fraction(1, 4)  # 3/8 * 2/3
+        assert note_events[1].start_time == Fraction(1, 4)
+        assert note_events[1].duration == Fraction(1, 30)  # 1/16 * 4/5 * 2/3
+        assert note_events[6].start_time == Fraction(5, 12)
+        assert note_events[6].duration == Fraction(1, 6)
+        assert note_events[7].start_time == Fraction(7, 12)
 
 
 class TestDynamicsCompilation:
@@ -423,6 +485,64 @@ class TestTempoCompilation:
         assert tempo_events[0].bpm == 120
         assert tempo_events[0].start_time == Fraction(0)
 
+    def test_restated_tempo_at_start_not_duplicated(self):
+        """Test a tempo mark repeating the score tempo at the start is dropped."""
+        source = """
+        score {
+            tempo 120
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        tempo 120
+                        C4 h
+                        tempo 90
+                        D4 h
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        tempo_events = [e for e in graph.events if isinstance(e, TempoEvent)]
+        assert [(e.start_time, e.bpm) for e in tempo_events] == [
+            (Fraction(0), 120),
+            (Fraction(1, 2), 90),
+        ]
+    
+    def test_restated_tempo_after_other_staff_change_kept(self):
+        """Test a mark restating the header after another staff's change is kept."""
+        source = """
+        score {
+            tempo 120
+            time 4/4
+            staff upper {
+                voice 1 {
+                    measure {
+                        tempo 90
+                        C4 w
+                    }
+                }
+            }
+            staff lower {
+                voice 1 {
+                    measure {
+                        tempo 120
+                        C3 w
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        tempo_events = [e for e in graph.events if isinstance(e, TempoEvent)]
+        assert [e.bpm for e in tempo_events] == [120, 90, 120]
+        assert all(e.start_time == 0 for e in tempo_events)
+
 
 class TestEventGraphDuration:
     """Test event graph duration calculation."""
@@ -481,4 +601,75 @@ class TestEventSorting:
         for event in graph:
             assert event.start_time >= prev_time
             prev_time = event.start_time
+    
+    def test_sort_after_add(self):
+        """Test that events added after compilation are sorted in."""
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 w
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        graph.add(TempoEvent(
+            start_time=Fraction(0), staff_id="__global__", voice_id=0, bpm=90,
+        ))
+        graph.sort()
+        
+        assert isinstance(graph.events[0], TempoEvent)
+    
+    def test_sort_after_direct_append(self):
+        """Test that events appended to the list directly are sorted in."""
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 h
+                        D4 h
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        graph.events.append(TempoEvent(
+            start_time=Fraction(0), staff_id="__global__", voice_id=0, bpm=90,
+        ))
+        graph.sort()
+        
+        assert isinstance(graph.events[0], TempoEvent)
+    
+    def test_sort_marker_not_pickled(self):
+        """Test that a pickled graph carries only its events and metadata."""
+        import pickle
+        
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 w
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        assert "_sorted_length" not in graph.__getstate__()
+        restored = pickle.loads(pickle.dumps(graph))
+        assert restored.events == graph.events
+        assert restored._sorted_length is None
 
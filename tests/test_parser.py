@@ -7,7 +7,7 @@ from fractions import Fraction
 
 from clef.parser import parse, ClefParseError
 from clef.ast.nodes import (
-    Score, Staff, Voice, Measure, Note, Rest, Chord,
+    Score, Staff, Voice, VoiceBlock, Measure, Note, Rest, Chord,
     Pitch, Duration, Accidental, TimeSignature, TempoMark,
     KeySignature, Dynamic, Tuplet, Slur, Pedal, PedalType,
     Articulation, ArticulationType, Trill,
@@ -129,6 +129,51 @@ class TestVoiceParsing:
         voices = [v for v in score.staves[0].contents if isinstance(v, Voice)]
         assert len(voices) == 2
 
+    def test_content_views(self):
+        """Test the per-kind views over staff and voice contents."""
+        source = """
+        score {
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 q
+                        D4 h.
+                    }
+                    measure {
+                        E4 w
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        staff = score.staves[0]
+        assert len(staff.voices) == 1
+        assert staff.measures == ()
+        assert len(staff.voices[0].measures) == 2
+
+    def test_voice_blocks_in_measure(self):
+        """Test parsing voice groups inside a measure."""
+        source = """
+        score {
+            staff piano {
+                measure {
+                    mf
+                    voice 1 { C5 h D5 h }
+                    voice 2 { C4 w }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        measure = score.staves[0].measures[0]
+        assert isinstance(measure.contents[0], Dynamic)
+        
+        blocks = measure.contents[1:]
+        assert all(isinstance(b, VoiceBlock) for b in blocks)
+        assert [b.number for b in blocks] == [1, 2]
+        assert [n.pitch.name for n in blocks[0].contents] == ["C", "D"]
+
 
 class TestNoteParsing:
     """Test note parsing."""
@@ -217,7 +262,50 @@ class TestNoteParsing:
         notes = [n for n in measures[0].contents if isinstance(n, Note)]
         
         assert notes[0].duration.dots == 2
-    
+
+    def test_repeated_pitches_are_shared(self):
+        """Test that identical pitches and durations share one instance."""
+        source = """
+        score {
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 q
+                        D4 q
+                        C4 q
+                        D4 q.
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        voices = [v for v in score.staves[0].contents if isinstance(v, Voice)]
+        measures = [m for m in voices[0].contents if isinstance(m, Measure)]
+        notes = [n for n in measures[0].contents if isinstance(n, Note)]
+
+        assert notes[0].pitch is notes[2].pitch
+        assert notes[0].duration is notes[1].duration
+        assert notes[3].duration is not notes[1].duration
+        assert notes[3].duration.dots == 1
+
+    def test_unknown_pitch_name(self):
+        """Test that a pitch with an invalid note name is rejected."""
+        for name in ("@", "H", "CD"):
+            with pytest.raises(ValueError, match="Unknown pitch name"):
+                Pitch(name=name, octave=4)
+
+    def test_pitch_equality_and_hash(self):
+        """Test that pitches compare by spelling, not by MIDI number."""
+        a = Pitch(name="C", octave=4, accidental=Accidental.SHARP)
+        b = Pitch(name="C", octave=4, accidental=Accidental.SHARP)
+        enharmonic = Pitch(name="D", octave=4, accidental=Accidental.FLAT)
+
+        assert a == b and hash(a) == hash(b)
+        assert a != enharmonic
+        assert a.enharmonic_equal(enharmonic)
+        assert len({a, b, enharmonic}) == 2
+
     def test_tied_note(self):
         """Test parsing a tied note."""
         source = """
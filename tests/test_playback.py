@@ -12,6 +12,61 @@ from clef.engine import compile_score
 from clef.backends import MidiFileBackend
 
 
+def _read_varlen(data, pos):
+    """Read a MIDI variable-length quantity, returning (value, next_pos)."""
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def _midi_messages(data):
+    """Decode a Standard MIDI File into (track, tick, message) tuples."""
+    messages = []
+    pos = 14  # past the MThd header chunk
+    track = 0
+    while pos < len(data):
+        end = pos + 8 + int.from_bytes(data[pos + 4:pos + 8], "big")
+        pos += 8
+        tick = 0
+        running_status = 0
+        while pos < end:
+            delta, pos = _read_varlen(data, pos)
+            tick += delta
+            status = running_status
+            if data[pos] & 0x80:
+                status = data[pos]
+                pos += 1
+            if status == 0xFF:
+                meta_type = data[pos]
+                length, pos = _read_varlen(data, pos + 1)
+                message = bytes([status, meta_type]) + data[pos:pos + length]
+                pos += length
+            elif status in (0xF0, 0xF7):
+                length, pos = _read_varlen(data, pos)
+                message = bytes([status]) + data[pos:pos + length]
+                pos += length
+            else:
+                running_status = status
+                size = 1 if status & 0xF0 in (0xC0, 0xD0) else 2
+                message = bytes([status]) + data[pos:pos + size]
+                pos += size
+            messages.append((track, tick, message))
+        track += 1
+    return messages
+
+
+def _meta_messages(messages, meta_type):
+    """Filter decoded messages down to one kind of meta event."""
+    return [
+        (track, tick) for track, tick, message in messages
+        if message[0] == 0xFF and message[1] == meta_type
+    ]
+
+
 class TestMidiExport:
     """Test MIDI file export."""
     
@@ -81,6 +136,112 @@ class TestMidiExport:
             
             assert output_path.exists()
     
+    def test_export_voices_sharing_a_key(self):
+        """Test exporting voices that strike the same key at once."""
+        source = """
+        score {
+            time 4/4
+            staff piano {
+                voice 1 {
+                    measure {
+                        C4 h
+                        D4 h
+                    }
+                }
+                voice 2 {
+                    measure {
+                        C4 q
+                        E4 q
+                        F4 h
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        backend = MidiFileBackend()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "shared.mid"
+            backend.export_midi(graph, output_path)
+            
+            messages = _midi_messages(output_path.read_bytes())
+        
+        note_ons = {}
+        note_offs = {}
+        for _, tick, message in messages:
+            kind = message[0] & 0xF0
+            if kind == 0x90 and message[2] > 0:
+                note_ons.setdefault(message[1], []).append(tick)
+            elif kind == 0x80 or kind == 0x90:
+                note_offs.setdefault(message[1], []).append(tick)
+        
+        ppqn = MidiFileBackend.PPQN
+        assert note_ons == {60: [0], 64: [ppqn], 62: [2 * ppqn], 65: [2 * ppqn]}
+        assert {pitch: len(ticks) for pitch, ticks in note_offs.items()} == {
+            60: 1, 64: 1, 62: 1, 65: 1,
+        }
+        
+        # The shared C4 sounds once, for the longer (half note) of the two
+        c4_lengths = sorted(
+            backend._to_ticks(event.effective_duration())
+            for event in graph.get_note_events() if event.midi_note == 60
+        )
+        assert c4_lengths[0] < c4_lengths[1]
+        assert note_offs[60] == [c4_lengths[1]]
+        assert len(_meta_messages(messages, 0x51)) == 1
+        assert len(_meta_messages(messages, 0x58)) == 1
+    
+    def test_shared_tempo_changes_written_once(self):
+        """Test that a tempo change restated on every staff is written once."""
+        source = """
+        score {
+            tempo 100
+            time 3/4
+            staff upper {
+                voice 1 {
+                    measure {
+                        C5 h.
+                    }
+                    measure {
+                        tempo 80
+                        time 2/4
+                        C5 h
+                    }
+                }
+            }
+            staff lower {
+                voice 1 {
+                    measure {
+                        C3 h.
+                    }
+                    measure {
+                        tempo 80
+                        time 2/4
+                        C3 h
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        backend = MidiFileBackend()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "tempo.mid"
+            backend.export_midi(graph, output_path)
+            
+            messages = _midi_messages(output_path.read_bytes())
+        
+        # Initial values plus one change each, all on the global track
+        change = 3 * MidiFileBackend.PPQN
+        assert _meta_messages(messages, 0x51) == [(0, 0), (0, change)]
+        assert _meta_messages(messages, 0x58) == [(0, 0), (0, change)]
+    
     def test_export_multiple_staves(self):
         """Test exporting a score with multiple staves."""
         source = """
@@ -114,6 +275,41 @@ class TestMidiExport:
             
             assert output_path.exists()
     
+    def test_tracks_follow_staff_order(self):
+        """Test that tracks are laid out in the order staves are declared."""
+        source = """
+        score {
+            time 4/4
+            staff upper {
+                voice 1 {
+                    measure {
+                        rest q
+                        C5 q
+                        C5 h
+                    }
+                }
+            }
+            staff lower {
+                voice 1 {
+                    measure {
+                        C3 w
+                    }
+                }
+            }
+        }
+        """
+        score = parse(source)
+        graph = compile_score(score)
+        
+        backend = MidiFileBackend()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "order.mid"
+            backend.export_midi(graph, output_path)
+            
+            data = output_path.read_bytes()
+            assert data.index(b"upper") < data.index(b"lower")
+    
     def test_export_with_dynamics(self):
         """Test exporting a score with dynamics."""
         source = """
@@ -258,3 +454,86 @@ class TestFluidSynthBackend:
         except (ImportError, OSError, Exception):
             pytest.skip("FluidSynth not installed or not working on this system")
 
+    
+    def test_repeated_pitch_in_tuplet_releases_before_restrike(self):
+        """Test a note-off is never scheduled after the note-on it precedes."""
+        from clef.backends import FluidSynthBackend
+        
+        notes = "C4 e tenuto\n" * 5
+        source = f"""
+        score {{
+            tempo 120
+            time 4/4
+            staff piano {{
+                voice 1 {{
+                    measure {{
+                        tuplet 5 in 4 {{
+                            {notes}
+                        }}
+                        rest h
+                    }}
+                }}
+            }}
+        }}
+        """
+        graph = compile_score(parse(source))
+        
+        timeline = [
+            (seconds, kind)
+            for seconds, (kind, _) in FluidSynthBackend()._convert_to_seconds(graph)
+            if kind != "other"
+        ]
+        
+        # Each re-strike follows the previous note's release at the same time
+        assert [kind for _, kind in timeline] == (
+            ["note_on"] + ["note_off", "note_on"] * 4 + ["note_off"]
+        )
+        for (off_time, _), (on_time, _) in zip(timeline[1:-1:2], timeline[2::2]):
+            assert off_time == on_time
+    
+    def test_playback_only_waits_for_synth_events(self):
+        """Test that rests, dynamics and meter changes don't pace playback."""
+        from unittest.mock import Mock
+        from clef.backends import FluidSynthBackend
+        from clef.backends.fluidsynth_backend import SCHEDULE_LATENCY
+        
+        source = """
+        score {
+            tempo 240
+            time 4/4
+            staff flute : flute {
+                voice 1 {
+                    measure {
+                        rest q
+                        mf
+                        C5 q
+                        rest h
+                    }
+                    measure {
+                        time 2/4
+                        rest q
+                        ff
+                        D5 q
+                    }
+                }
+            }
+        }
+        """
+        graph = compile_score(parse(source))
+        
+        backend = FluidSynthBackend()
+        backend._synth = Mock()
+        backend._sequencer = Mock()
+        backend._sequencer.get_tick.return_value = 0
+        backend._stop_event = Mock()
+        backend._stop_event.is_set.return_value = False
+        backend._stop_event.wait.return_value = False
+        
+        backend._play_events(graph)
+        
+        # Only the opening program change waits, then the tail of the notes
+        waits = [call.args[0] for call in backend._stop_event.wait.call_args_list]
+        assert len(waits) == 2
+        assert waits[0] <= SCHEDULE_LATENCY
+        backend._synth.program_select.assert_called_once()
+        assert backend._sequencer.note_on.call_count == 2
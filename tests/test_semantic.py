@@ -347,3 +347,4 @@ class TestNonStrictMode:
         # Both measures are wrong (too short)
         assert len(context.errors) == 2
 
+        assert context.total_measures == 2